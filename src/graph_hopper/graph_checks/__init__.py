@@ -2,19 +2,36 @@
 Graph checks package for analyzing TTL graphs for BACnet network issues.
 """
 
-from .duplicate_devices import check_duplicate_device_ids
-from .duplicate_networks import check_duplicate_networks
-from .duplicate_bbmds import check_duplicate_bbmds
-from .orphaned_devices import check_orphaned_devices
-from .oversized_networks import check_oversized_networks
-from .broadcast_domains import check_broadcast_domains
-from .routing_inefficiencies import check_routing_inefficiencies
+import importlib
+
 from .utils import format_human_readable, format_json_output, BACNET_NS
 from .registry import ISSUE_REGISTRY
 
+# Check functions are imported on first access, so loading the package (and
+# with it the CLI) doesn't import every check module up front
+_LAZY_EXPORTS = {
+    'check_duplicate_device_ids': 'duplicate_devices',
+    'check_duplicate_networks': 'duplicate_networks',
+    'check_duplicate_bbmds': 'duplicate_bbmds',
+    'check_orphaned_devices': 'orphaned_devices',
+    'check_oversized_networks': 'oversized_networks',
+    'check_broadcast_domains': 'broadcast_domains',
+    'check_routing_inefficiencies': 'routing_inefficiencies',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     'check_duplicate_device_ids',
-    'check_duplicate_networks', 
+    'check_duplicate_networks',
     'check_duplicate_bbmds',
     'check_orphaned_devices',
     'check_oversized_networks',
@@ -10,9 +10,19 @@ devices that share the same address within the same network segment.
 
 from typing import List, Tuple, Any, Dict
 from collections import defaultdict
-from rdflib import Graph, URIRef
+from rdflib import Graph
 import rdflib.term
-from .utils import BACNET_NS
+from .utils import BACNET_NS, RDF_TYPE, RDFS_LABEL
+
+
+# Description templates shared by the network and subnet passes
+_DESC_TMPL = '{n} devices share address {addr} on {scope} {net}'
+_VERBOSE_TMPL = (
+    'Address conflict detected on {scope} {net}: '
+    'Address {addr} is assigned to {n} devices: '
+    '{names}. This will cause communication failures '
+    'as multiple devices cannot share the same address on the same network segment.'
+)
 
 
 def check_device_address_conflicts(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node]]:
@@ -32,33 +42,36 @@ def check_device_address_conflicts(graph: Graph, verbose: bool = False) -> Tuple
     
     # Find all devices and group them by network/subnet
     device_type = BACNET_NS['Device']
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
+    
+    # Nothing can conflict if no node carries an address at all
+    if (None, BACNET_NS['address'], None) not in graph:
+        return issues, affected_triples, affected_nodes
     
     # Data structures to track devices by network/subnet and address
     network_devices = defaultdict(list)  # network -> [(device, address), ...]
     subnet_devices = defaultdict(list)   # subnet -> [(device, address), ...]
     
     # First pass: collect all devices with their network/subnet membership and addresses
-    for device, _, _ in graph.triples((None, rdf_type, device_type)):
+    for device, _, _ in graph.triples((None, RDF_TYPE, device_type)):
         # Get device properties
         device_name = None
         device_instance = None
         device_address = None
         
         # Extract device name/label
-        for _, _, label_value in graph.triples((device, URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
+        label_value = graph.value(device, RDFS_LABEL)
+        if label_value is not None:
             device_name = str(label_value)
-            break
         
         # Extract device instance
-        for _, _, instance_value in graph.triples((device, BACNET_NS['device-instance'], None)):
+        instance_value = graph.value(device, BACNET_NS['device-instance'])
+        if instance_value is not None:
             device_instance = str(instance_value)
-            break
             
         # Extract address
-        for _, _, address_value in graph.triples((device, BACNET_NS['address'], None)):
+        address_value = graph.value(device, BACNET_NS['address'])
+        if address_value is not None:
             device_address = str(address_value)
-            break
             
         # Use defaults if not found
         final_device_name = device_name if device_name else f"Device {device_instance if device_instance else 'Unknown'}"
@@ -110,16 +123,14 @@ def check_device_address_conflicts(graph: Graph, verbose: bool = False) -> Tuple
                     'address': address,
                     'device_count': len(conflicting_devices),
                     'devices': conflicting_devices,
-                    'description': f'{len(conflicting_devices)} devices share address {address} on network {network}'
+                    'description': _DESC_TMPL.format(n=len(conflicting_devices), addr=address, scope='network', net=network)
                 }
                 
                 if verbose:
                     device_names = [dev['device_name'] for dev in conflicting_devices]
-                    issue['verbose_description'] = (
-                        f'Address conflict detected on network {network}: '
-                        f'Address {address} is assigned to {len(conflicting_devices)} devices: '
-                        f'{", ".join(device_names)}. This will cause communication failures '
-                        f'as multiple devices cannot share the same address on the same network segment.'
+                    issue['verbose_description'] = _VERBOSE_TMPL.format(
+                        scope='network', net=network, addr=address,
+                        n=len(conflicting_devices), names=", ".join(device_names)
                     )
                 
                 issues.append(issue)
@@ -147,16 +158,14 @@ def check_device_address_conflicts(graph: Graph, verbose: bool = False) -> Tuple
                     'address': address,
                     'device_count': len(conflicting_devices),
                     'devices': conflicting_devices,
-                    'description': f'{len(conflicting_devices)} devices share address {address} on subnet {subnet}'
+                    'description': _DESC_TMPL.format(n=len(conflicting_devices), addr=address, scope='subnet', net=subnet)
                 }
                 
                 if verbose:
                     device_names = [dev['device_name'] for dev in conflicting_devices]
-                    issue['verbose_description'] = (
-                        f'Address conflict detected on subnet {subnet}: '
-                        f'Address {address} is assigned to {len(conflicting_devices)} devices: '
-                        f'{", ".join(device_names)}. This will cause communication failures '
-                        f'as multiple devices cannot share the same address on the same network segment.'
+                    issue['verbose_description'] = _VERBOSE_TMPL.format(
+                        scope='subnet', net=subnet, addr=address,
+                        n=len(conflicting_devices), names=", ".join(device_names)
                     )
                 
                 issues.append(issue)
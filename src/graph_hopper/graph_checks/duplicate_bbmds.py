@@ -7,7 +7,7 @@ from typing import List, Dict, Any, Tuple
 import rdflib
 from rdflib import Graph
 
-from .utils import BACNET_NS
+from .utils import BACNET_NS, RDF_TYPE
 
 
 def check_duplicate_bbmds(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node]]:
@@ -29,86 +29,85 @@ def check_duplicate_bbmds(graph: Graph, verbose: bool = False) -> Tuple[List[Dic
     affected_triples = []
     affected_nodes = []
     
+    # Find all BBMDs up front - this is the lookup that fails on malformed graphs
     try:
-        # Find all BBMDs and their subnets/BDT entries
-        bbmd_info = {}
+        if (None, RDF_TYPE, BACNET_NS['BBMD']) not in graph:
+            return issues, affected_triples, affected_nodes
+        bbmds_query = list(graph.triples((None, RDF_TYPE, BACNET_NS['BBMD'])))
+    except Exception as e:
+        click.echo(f"Error analyzing graph for duplicate BBMDs: {e}", err=True)
+        return [], [], []
+    
+    # First pass: collect all BBMDs with their subnets and BDT entries
+    bbmd_info = {}
+    
+    for bbmd, _, _ in bbmds_query:
+        subnets = []
+        bdt_entries = []
         
-        # First pass: collect all BBMDs with their subnets and BDT entries
-        rdf_type = rdflib.URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
-        bbmds_query = graph.triples((None, rdf_type, BACNET_NS['BBMD']))
+        # Get broadcast domains (subnets) for this BBMD
+        for _, _, subnet in graph.triples((bbmd, BACNET_NS['bbmd-broadcast-domain'], None)):
+            subnets.append(subnet)
         
-        for bbmd, _, _ in bbmds_query:
-            subnets = []
-            bdt_entries = []
+        # Get BDT entries for this BBMD
+        for _, _, bdt_entry in graph.triples((bbmd, BACNET_NS['bdt-entry'], None)):
+            bdt_entries.append(str(bdt_entry))
+        
+        if subnets:  # Only track BBMDs that have broadcast domains
+            bbmd_info[bbmd] = {
+                'subnets': subnets,
+                'bdt_entries': bdt_entries,
+                'has_bdt': len(bdt_entries) > 0
+            }
+    
+    # Second pass: group by subnet to find duplicates
+    subnet_to_bbmds = {}
+    for bbmd, info in bbmd_info.items():
+        for subnet in info['subnets']:
+            if subnet not in subnet_to_bbmds:
+                subnet_to_bbmds[subnet] = []
+            subnet_to_bbmds[subnet].append({
+                'bbmd': str(bbmd),
+                'bdt_entries': info['bdt_entries'],
+                'has_bdt': info['has_bdt']
+            })
+    
+    # Third pass: identify duplicate BBMDs on same subnet
+    for subnet, bbmd_list in subnet_to_bbmds.items():
+        if len(bbmd_list) > 1:
+            # Multiple BBMDs on same subnet
+            bbmds_with_bdt = [bbmd for bbmd in bbmd_list if bbmd['has_bdt']]
             
-            # Get broadcast domains (subnets) for this BBMD
-            for _, _, subnet in graph.triples((bbmd, BACNET_NS['bbmd-broadcast-domain'], None)):
-                subnets.append(str(subnet))
+            if len(bbmds_with_bdt) > 1:
+                # Error: Multiple BBMDs with BDT entries on same subnet
+                issue_type = 'duplicate-bbmd-error'
+                severity = 'error'
+                description = 'Multiple BBMDs with BDT entries on the same subnet'
+            else:
+                # Warning: Multiple BBMDs on same subnet but not all have BDT entries
+                issue_type = 'duplicate-bbmd-warning'
+                severity = 'warning'
+                description = 'Multiple BBMDs on the same subnet'
             
-            # Get BDT entries for this BBMD
-            for _, _, bdt_entry in graph.triples((bbmd, BACNET_NS['bdt-entry'], None)):
-                bdt_entries.append(str(bdt_entry))
+            issue = {
+                'issue_type': issue_type,
+                'severity': severity,
+                'subnet': str(subnet),
+                'bbmd_count': len(bbmd_list),
+                'bbmds': bbmd_list,
+                'bbmds_with_bdt_count': len(bbmds_with_bdt),
+                'description': description
+            }
+            issues.append(issue)
+            affected_nodes.extend([rdflib.URIRef(bbmd_info['bbmd']) for bbmd_info in bbmd_list])
+            affected_nodes.append(str(subnet))
             
-            if subnets:  # Only track BBMDs that have broadcast domains
-                bbmd_info[str(bbmd)] = {
-                    'subnets': subnets,
-                    'bdt_entries': bdt_entries,
-                    'has_bdt': len(bdt_entries) > 0
-                }
-        
-        # Second pass: group by subnet to find duplicates
-        subnet_to_bbmds = {}
-        for bbmd, info in bbmd_info.items():
-            for subnet in info['subnets']:
-                if subnet not in subnet_to_bbmds:
-                    subnet_to_bbmds[subnet] = []
-                subnet_to_bbmds[subnet].append({
-                    'bbmd': bbmd,
-                    'bdt_entries': info['bdt_entries'],
-                    'has_bdt': info['has_bdt']
-                })
-        
-        # Third pass: identify duplicate BBMDs on same subnet
-        for subnet, bbmd_list in subnet_to_bbmds.items():
-            if len(bbmd_list) > 1:
-                # Multiple BBMDs on same subnet
-                bbmds_with_bdt = [bbmd for bbmd in bbmd_list if bbmd['has_bdt']]
-                
-                if len(bbmds_with_bdt) > 1:
-                    # Error: Multiple BBMDs with BDT entries on same subnet
-                    issue_type = 'duplicate-bbmd-error'
-                    severity = 'error'
-                    description = 'Multiple BBMDs with BDT entries on the same subnet'
-                else:
-                    # Warning: Multiple BBMDs on same subnet but not all have BDT entries
-                    issue_type = 'duplicate-bbmd-warning'
-                    severity = 'warning'
-                    description = 'Multiple BBMDs on the same subnet'
-                
-                issue = {
-                    'issue_type': issue_type,
-                    'severity': severity,
-                    'subnet': subnet,
-                    'bbmd_count': len(bbmd_list),
-                    'bbmds': bbmd_list,
-                    'bbmds_with_bdt_count': len(bbmds_with_bdt),
-                    'description': description
-                }
-                issues.append(issue)
-                affected_nodes.extend([rdflib.URIRef(bbmd_info['bbmd']) for bbmd_info in bbmd_list])
-                affected_nodes.append(subnet)
-                
-                if verbose:
-                    # Collect affected triples for all BBMDs involved
-                    for bbmd_info in bbmd_list:
-                        bbmd_uri = rdflib.URIRef(bbmd_info['bbmd'])
-                        affected_nodes.append(bbmd_uri)
-                        for triple in graph.triples((bbmd_uri, None, None)):
-                            affected_triples.append(triple)
+            if verbose:
+                # Collect affected triples for all BBMDs involved
+                for bbmd_info in bbmd_list:
+                    bbmd_uri = rdflib.URIRef(bbmd_info['bbmd'])
+                    affected_nodes.append(bbmd_uri)
+                    for triple in graph.triples((bbmd_uri, None, None)):
+                        affected_triples.append(triple)
 
-    
-    except Exception as e:
-        click.echo(f"Error analyzing graph for duplicate BBMDs: {e}", err=True)
-        return [], []
-    
     return issues, affected_triples, affected_nodes
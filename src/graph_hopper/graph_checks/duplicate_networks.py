@@ -7,7 +7,7 @@ from typing import List, Dict, Any, Tuple
 import rdflib
 from rdflib import Graph
 
-from .utils import BACNET_NS
+from .utils import BACNET_NS, RDF_TYPE
 
 
 def check_duplicate_networks(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node]]:
@@ -29,81 +29,79 @@ def check_duplicate_networks(graph: Graph, verbose: bool = False) -> Tuple[List[
     affected_triples = []
     affected_nodes = []
     
+    # Find all routers up front - this is the lookup that fails on malformed graphs
     try:
-        # Find all routers and their networks/subnets
-        router_networks = {}
+        if (None, RDF_TYPE, BACNET_NS['Router']) not in graph:
+            return issues, affected_triples, affected_nodes
+        routers_query = list(graph.triples((None, RDF_TYPE, BACNET_NS['Router'])))
+    except Exception as e:
+        click.echo(f"Error analyzing graph for duplicate networks: {e}", err=True)
+        return [], [], []
+    
+    # First pass: collect all routers with their networks and subnets  
+    router_networks = {}
+    for router, _, _ in routers_query:
+        networks = []
+        subnets = []
         
-        # First pass: collect all routers with their networks and subnets  
-        rdf_type = rdflib.URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
-        routers_query = graph.triples((None, rdf_type, BACNET_NS['Router']))
-        for router, _, _ in routers_query:
-            networks = []
-            subnets = []
-            
-            # Get networks for this router
-            for _, _, network in graph.triples((router, BACNET_NS['device-on-network'], None)):
-                networks.append(str(network))
-            
-            # Get subnet for this router  
-            for _, _, subnet in graph.triples((router, BACNET_NS['device-on-subnet'], None)):
-                subnets.append(str(subnet))
-            
-            if networks:  # Only track routers that have networks
-                router_networks[str(router)] = {
-                    'networks': networks,
-                    'subnets': subnets
-                }
+        # Get networks for this router
+        for _, _, network in graph.triples((router, BACNET_NS['device-on-network'], None)):
+            networks.append(network)
         
-        # Second pass: group by network number to find duplicates
-        network_to_routers = {}
-        for router, info in router_networks.items():
-            for network in info['networks']:
-                if network not in network_to_routers:
-                    network_to_routers[network] = []
-                network_to_routers[network].append({
-                    'router': router,
-                    'subnets': info['subnets']
-                })
+        # Get subnet for this router  
+        for _, _, subnet in graph.triples((router, BACNET_NS['device-on-subnet'], None)):
+            subnets.append(str(subnet))
         
-        # Third pass: identify duplicate networks
-        for network, router_list in network_to_routers.items():
-            if len(router_list) > 1:
-                # Multiple routers have the same network number
-                # Check if they're on same or different subnets
-                all_subnets = set()
-                for router_info in router_list:
-                    all_subnets.update(router_info['subnets'])
-                
-                if len(all_subnets) == 1:
-                    # Same subnet - likely duplicate router
-                    issue_type = 'duplicate-router'
-                    description = 'Same network number on multiple routers in the same subnet'
-                else:
-                    # Different subnets - likely duplicate network
-                    issue_type = 'duplicate-network' 
-                    description = 'Same network number on routers in different subnets'
-                
-                issue = {
-                    'issue_type': issue_type,
-                    'network': network,
-                    'router_count': len(router_list),
-                    'routers': router_list,
-                    'subnets': list(all_subnets),
-                    'description': description
-                }
-                issues.append(issue)
-                affected_nodes.append(network)
-                affected_nodes.extend([router_info['router'] for router_info in router_list])
-                
-                if verbose:
-                    # Collect affected triples for all routers involved
-                    for router_info in router_list:
-                        router_uri = rdflib.URIRef(router_info['router'])
-                        for triple in graph.triples((router_uri, None, None)):
-                            affected_triples.append(triple)
+        if networks:  # Only track routers that have networks
+            router_networks[router] = {
+                'networks': networks,
+                'subnets': subnets
+            }
     
-    except Exception as e:
-        click.echo(f"Error analyzing graph for duplicate networks: {e}", err=True)
-        return [], [], []
+    # Second pass: group by network number to find duplicates
+    network_to_routers = {}
+    for router, info in router_networks.items():
+        for network in info['networks']:
+            if network not in network_to_routers:
+                network_to_routers[network] = []
+            network_to_routers[network].append({
+                'router': str(router),
+                'subnets': info['subnets']
+            })
     
+    # Third pass: identify duplicate networks
+    for network, router_list in network_to_routers.items():
+        if len(router_list) > 1:
+            # Multiple routers have the same network number
+            # Check if they're on same or different subnets
+            all_subnets = set().union(*(router_info['subnets'] for router_info in router_list))
+            
+            if len(all_subnets) == 1:
+                # Same subnet - likely duplicate router
+                issue_type = 'duplicate-router'
+                description = 'Same network number on multiple routers in the same subnet'
+            else:
+                # Different subnets - likely duplicate network
+                issue_type = 'duplicate-network' 
+                description = 'Same network number on routers in different subnets'
+            
+            issue = {
+                'issue_type': issue_type,
+                'network': str(network),
+                'router_count': len(router_list),
+                'routers': router_list,
+                'subnets': list(all_subnets),
+                'description': description
+            }
+            issues.append(issue)
+            affected_nodes.append(str(network))
+            affected_nodes.extend([router_info['router'] for router_info in router_list])
+            
+            if verbose:
+                # Collect affected triples for all routers involved
+                for router_info in router_list:
+                    router_uri = rdflib.URIRef(router_info['router'])
+                    for triple in graph.triples((router_uri, None, None)):
+                        affected_triples.append(triple)
+
     return issues, affected_triples, affected_nodes
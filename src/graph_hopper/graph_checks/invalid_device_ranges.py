@@ -8,9 +8,9 @@ BACnet Standard: Device instance numbers must be in range 0 to 4,194,303 (0x3FFF
 """
 
 from typing import List, Tuple, Any, Dict
-from rdflib import Graph, URIRef
+from rdflib import Graph
 import rdflib.term
-from .utils import BACNET_NS
+from .utils import BACNET_NS, RDF_TYPE, RDFS_LABEL
 
 
 def check_invalid_device_ranges(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node]]:
@@ -34,18 +34,17 @@ def check_invalid_device_ranges(graph: Graph, verbose: bool = False) -> Tuple[Li
     
     # Find all device instances using triple patterns
     device_type = BACNET_NS['Device']
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
     
-    for device, _, _ in graph.triples((None, rdf_type, device_type)):
+    for device, _, _ in graph.triples((None, RDF_TYPE, device_type)):
         # Get device properties
         device_name = None
         device_instance = None
         device_address = None
         
         # Extract device name/label
-        for _, _, label_value in graph.triples((device, URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
+        label_value = graph.value(device, RDFS_LABEL)
+        if label_value is not None:
             device_name = str(label_value)
-            break
         
         # Skip Grasshopper nodes - check both URI and label
         device_uri = str(device)
@@ -53,14 +52,14 @@ def check_invalid_device_ranges(graph: Graph, verbose: bool = False) -> Tuple[Li
             continue
         
         # Extract device instance
-        for _, _, instance_value in graph.triples((device, BACNET_NS['device-instance'], None)):
+        instance_value = graph.value(device, BACNET_NS['device-instance'])
+        if instance_value is not None:
             device_instance = str(instance_value)
-            break
             
         # Extract address
-        for _, _, address_value in graph.triples((device, BACNET_NS['address'], None)):
+        address_value = graph.value(device, BACNET_NS['address'])
+        if address_value is not None:
             device_address = str(address_value)
-            break
             
         # Use defaults if not found
         if not device_name:
@@ -80,7 +79,7 @@ def check_invalid_device_ranges(graph: Graph, verbose: bool = False) -> Tuple[Li
             issue = {
                 'issue_type': 'invalid-device-ranges',
                 'severity': 'critical',
-                'device': str(device),
+                'device': device_uri,
                 'label': device_name,
                 'device_instance': device_instance,
                 'address': device_address,
@@ -104,7 +103,7 @@ def check_invalid_device_ranges(graph: Graph, verbose: bool = False) -> Tuple[Li
             issue = {
                 'issue_type': 'invalid-device-ranges',
                 'severity': 'critical',
-                'device': str(device),
+                'device': device_uri,
                 'label': device_name,
                 'device_instance': instance_id,
                 'address': device_address,
@@ -10,9 +10,54 @@ properties that are consistently included for properly discovered devices.
 """
 
 from typing import List, Tuple, Any, Dict
-from rdflib import Graph, URIRef
+from rdflib import Graph
 import rdflib.term
-from .utils import BACNET_NS
+from .utils import BACNET_NS, RDF_TYPE, RDFS_LABEL, build_device_index
+
+
+# Essential properties to check for (based on actual graph data)
+_ESSENTIAL_PROPERTIES = [
+    'device-instance',     # object identifier
+    'address',            # network address
+    'vendor-id',          # vendor identification  
+    'model-name',         # device model
+    'device-name',        # device name/label
+    'firmware-revision',  # firmware version
+    'device-on-network'   # network connectivity
+]
+
+# Critical properties (must have at least these)
+_CRITICAL_PROPERTIES = frozenset({
+    'device-instance',
+    'address',
+    'vendor-id'
+})
+
+# Property URIs resolved once at import rather than per call
+_ESSENTIAL_URIS = [(prop, BACNET_NS[prop]) for prop in _ESSENTIAL_PROPERTIES]
+_ESSENTIAL_URI_SET = frozenset(uri for _, uri in _ESSENTIAL_URIS)
+
+# Presence is tracked as a bitmask: bit i set means essential property i is present
+_PROPERTY_BITS = [(1 << i, prop, uri) for i, (prop, uri) in enumerate(_ESSENTIAL_URIS)]
+_FULL_MASK = (1 << len(_ESSENTIAL_URIS)) - 1
+_CRITICAL_MASK = sum(bit for bit, prop, _ in _PROPERTY_BITS if prop in _CRITICAL_PROPERTIES)
+
+# Short names for verbose output: known predicates map directly, anything
+# else in the BACnet namespace is named by slicing off the namespace prefix
+_BACNET_PREFIX = str(BACNET_NS)
+_BACNET_PREFIX_LEN = len(_BACNET_PREFIX)
+_KNOWN_PROPERTY_NAMES = {uri: prop for prop, uri in _ESSENTIAL_URIS}
+_KNOWN_PROPERTY_NAMES[RDFS_LABEL] = 'label'
+_KNOWN_PROPERTY_NAMES[RDF_TYPE] = 'type'
+
+# Issue description templates
+_DESC_TMPL = 'Device {name} (instance {instance}) is missing {missing}/{total} essential properties'
+_VERBOSE_TMPL = (
+    'Device {name} (URI: {uri}) has {prop_count} total properties '
+    'but is missing {missing} essential BACnet properties: {missing_names}. '
+    'Present essential properties: {present_names}.'
+)
+_VERBOSE_CRITICAL_TMPL = ' Critical missing properties: {critical_names}'
 
 
 def check_missing_properties(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node], List[rdflib.term.Node]]:
@@ -43,82 +88,53 @@ def check_missing_properties(graph: Graph, verbose: bool = False) -> Tuple[List[
     affected_nodes = []
     affected_triples = []  # Not used for this check but needed for consistency
     
-    # Find all devices
-    device_type = BACNET_NS['Device']
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
-    
-    # Define essential properties to check for (based on actual graph data)
-    essential_properties = [
-        'device-instance',     # object identifier
-        'address',            # network address
-        'vendor-id',          # vendor identification  
-        'model-name',         # device model
-        'device-name',        # device name/label
-        'firmware-revision',  # firmware version
-        'device-on-network'   # network connectivity
-    ]
+    essential_properties = _ESSENTIAL_PROPERTIES
+    property_names: Dict[rdflib.term.Node, str] = dict(_KNOWN_PROPERTY_NAMES)  # Verbose output: predicate -> short name
     
-    # Define critical properties (must have at least these)
-    critical_properties = [
-        'device-instance',
-        'address',
-        'vendor-id'
-    ]
+    # Find all devices; their properties were bucketed in one scan of the graph
+    # so the loop below never has to go back to the store
+    device_index = build_device_index(graph)
+    grasshopper_devices = device_index.grasshopper_devices
     
-    for device, _, _ in graph.triples((None, rdf_type, device_type)):
-        # Get device properties
-        device_name = None
-        device_instance = None
-        device_address = None
+    for record in device_index.devices.values():
+        device = record.node
         
-        # Extract device name/label
-        for _, _, label_value in graph.triples((device, URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
-            device_name = str(label_value)
-            break
+        # Skip Grasshopper nodes (matched on URI or label)
+        if device in grasshopper_devices:
+            continue
         
-        if not device_name:
-            device_name = str(device)
+        device_props = record.properties
         
-        # Skip Grasshopper nodes - check both URI and label
-        device_uri = str(device)
-        if (device_name and "Grasshopper" in device_name) or "Grasshopper" in device_uri:
+        # Fast path: device has all essential properties, no issue
+        if _ESSENTIAL_URI_SET.issubset(device_props):
             continue
         
-        # Extract device instance
-        for _, _, instance_value in graph.triples((device, BACNET_NS['device-instance'], None)):
-            device_instance = str(instance_value)
-            break
-            
+        present_mask = 0
+        for bit, _, prop_uri in _PROPERTY_BITS:
+            if prop_uri in device_props:
+                present_mask |= bit
+        missing_mask = _FULL_MASK ^ present_mask
+        
+        # Get device properties
+        device_name = record.label
+        device_instance = record.instance
+        device_address = record.address
+        
+        if not device_name:
+            device_name = record.uri
+        
         if not device_instance:
             device_instance = "unknown"
             
-        # Extract address
-        for _, _, address_value in graph.triples((device, BACNET_NS['address'], None)):
-            device_address = str(address_value)
-            break
-            
         if not device_address:
             device_address = "unknown"
         
-        # Count which essential properties this device has
-        present_properties = []
-        missing_properties = []
-        missing_critical = []
-        
-        for prop in essential_properties:
-            prop_uri = BACNET_NS[prop]
-            has_property = bool(list(graph.triples((device, prop_uri, None))))
-            
-            if has_property:
-                present_properties.append(prop)
-            else:
-                missing_properties.append(prop)
-                if prop in critical_properties:
-                    missing_critical.append(prop)
+        # Critical properties decide severity on their own; the total is a popcount
+        missing_critical = missing_mask & _CRITICAL_MASK
+        total_missing = missing_mask.bit_count()
         
         # Determine severity based on missing properties  
         severity = 'info'
-        total_missing = len(missing_properties)
         
         if missing_critical:
             severity = 'critical'
@@ -132,11 +148,14 @@ def check_missing_properties(graph: Graph, verbose: bool = False) -> Tuple[List[
             continue  # Device has all properties, no issue
         
         # Only report devices that are missing properties
-        if missing_properties:
+        if missing_mask:
+            present_properties = [prop for bit, prop, _ in _PROPERTY_BITS if present_mask & bit]
+            missing_properties = [prop for bit, prop, _ in _PROPERTY_BITS if missing_mask & bit]
+            
             issue = {
                 'issue_type': 'missing-properties',
                 'severity': severity,
-                'device': str(device),
+                'device': record.uri,
                 'device_name': device_name,
                 'device_instance': device_instance,
                 'address': device_address,
@@ -144,41 +163,52 @@ def check_missing_properties(graph: Graph, verbose: bool = False) -> Tuple[List[
                 'total_essential': len(essential_properties),
                 'missing_properties': missing_properties,
                 'present_properties': present_properties,
-                'description': f'Device {device_name} (instance {device_instance}) is missing {total_missing}/{len(essential_properties)} essential properties'
+                'description': _DESC_TMPL.format(
+                    name=device_name, instance=device_instance,
+                    missing=total_missing, total=len(essential_properties)
+                )
             }
             
             if verbose:
                 # Get all actual properties for this device
                 all_device_props = []
-                for _, pred, obj in graph.triples((device, None, None)):
+                for pred, objs in device_props.items():
                     pred_str = str(pred)
-                    # Extract property name from URI
-                    if pred_str.startswith(str(BACNET_NS)):
-                        prop_name = pred_str.replace(str(BACNET_NS), "")
-                    elif pred_str.endswith('#label'):
-                        prop_name = 'label'
-                    elif pred_str.endswith('#type'):
-                        prop_name = 'type'
-                    else:
-                        prop_name = pred_str.split('/')[-1].split('#')[-1]
+                    # Property names are derived once per distinct predicate
+                    prop_name = property_names.get(pred)
+                    if prop_name is None:
+                        prop_name = property_names[pred] = _get_property_name(pred_str)
                     
-                    all_device_props.append({
-                        'property': prop_name,
-                        'value': str(obj),
-                        'full_uri': pred_str
-                    })
+                    for obj in objs:
+                        all_device_props.append({
+                            'property': prop_name,
+                            'value': str(obj),
+                            'full_uri': pred_str
+                        })
                 
                 issue['all_properties'] = all_device_props
-                issue['verbose_description'] = (
-                    f'Device {device_name} (URI: {device}) has {len(all_device_props)} total properties '
-                    f'but is missing {total_missing} essential BACnet properties: {", ".join(missing_properties)}. '
-                    f'Present essential properties: {", ".join(present_properties) if present_properties else "none"}.'
+                issue['verbose_description'] = _VERBOSE_TMPL.format(
+                    name=device_name, uri=device, prop_count=len(all_device_props),
+                    missing=total_missing, missing_names=", ".join(missing_properties),
+                    present_names=", ".join(present_properties) if present_properties else "none"
                 )
                 
                 if missing_critical:
-                    issue['verbose_description'] += f' Critical missing properties: {", ".join(missing_critical)}'
+                    critical_names = [prop for bit, prop, _ in _PROPERTY_BITS if missing_critical & bit]
+                    issue['verbose_description'] += _VERBOSE_CRITICAL_TMPL.format(critical_names=", ".join(critical_names))
             
             issues.append(issue)
             affected_nodes.append(device)
     
     return issues, affected_triples, affected_nodes
+
+
+def _get_property_name(predicate_uri: str) -> str:
+    """Extract a short property name from a predicate URI."""
+    if predicate_uri.startswith(_BACNET_PREFIX):
+        return predicate_uri[_BACNET_PREFIX_LEN:]
+    elif predicate_uri.endswith('#label'):
+        return 'label'
+    elif predicate_uri.endswith('#type'):
+        return 'type'
+    return predicate_uri.split('/')[-1].split('#')[-1]
@@ -10,9 +10,16 @@ networks due to missing router connections.
 """
 
 from typing import List, Tuple, Any, Dict
-from rdflib import Graph, URIRef
+from rdflib import Graph
 import rdflib.term
-from .utils import BACNET_NS
+from .utils import BACNET_NS, RDF_TYPE, RDFS_LABEL, build_device_index, index_predicate
+
+
+_ROUTER = BACNET_NS['Router']
+_DEVICE_ON_NETWORK = BACNET_NS['device-on-network']
+_DEVICE_ON_SUBNET = BACNET_NS['device-on-subnet']
+_SUBNET_OF_NETWORK = BACNET_NS['subnet-of-network']
+_SERVES_NETWORK = BACNET_NS['serves-network']
 
 
 def check_missing_routers(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node]]:
@@ -30,40 +37,29 @@ def check_missing_routers(graph: Graph, verbose: bool = False) -> Tuple[List[Dic
     affected_nodes = []
     affected_triples = []
     
-    # Build network topology from the graph
-    networks_with_devices = set()
-    networks_with_routers = set()
-    router_type = BACNET_NS['Router']
-    device_type = BACNET_NS['Device']
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
+    # Build network topology from the graph. Device memberships come from the
+    # shared device index; router and subnet memberships are indexed once, so
+    # both network sets are plain set algebra over dicts
+    devices = build_device_index(graph).devices.values()
+    routers = list(graph.subjects(RDF_TYPE, _ROUTER))
+    on_network = index_predicate(graph, _DEVICE_ON_NETWORK)
+    on_subnet = index_predicate(graph, _DEVICE_ON_SUBNET)
+    subnet_of_network = index_predicate(graph, _SUBNET_OF_NETWORK)
+    serves_network = index_predicate(graph, _SERVES_NETWORK)
     
-    # Find all networks that have devices
-    for device, _, _ in graph.triples((None, rdf_type, device_type)):
-        # Check which network this device is on
-        for _, _, network in graph.triples((device, BACNET_NS['device-on-network'], None)):
-            networks_with_devices.add(network)
-            
-        # Also check for devices on subnets (get parent network)
-        for _, _, subnet in graph.triples((device, BACNET_NS['device-on-subnet'], None)):
-            # Find which network this subnet belongs to
-            for _, _, network in graph.triples((subnet, BACNET_NS['subnet-of-network'], None)):
-                networks_with_devices.add(network)
+    def parent_networks(subnets):
+        """Networks that the given subnets belong to."""
+        return {network for subnet in subnets for network in subnet_of_network.get(subnet, ())}
     
-    # Find networks that have routing capability
-    for router, _, _ in graph.triples((None, rdf_type, router_type)):
-        # Networks where the router is located
-        for _, _, network in graph.triples((router, BACNET_NS['device-on-network'], None)):
-            networks_with_routers.add(network)
-            
-        # Networks that the router serves (provides routing to)
-        for _, _, network in graph.triples((router, BACNET_NS['serves-network'], None)):
-            networks_with_routers.add(network)
-            
-        # Check for subnet connections (routers can connect subnets within networks)
-        for _, _, subnet in graph.triples((router, BACNET_NS['device-on-subnet'], None)):
-            # Find which network this subnet belongs to
-            for _, _, network in graph.triples((subnet, BACNET_NS['subnet-of-network'], None)):
-                networks_with_routers.add(network)
+    # Networks that have devices, directly or through their subnets
+    networks_with_devices = {network for record in devices for network in record.on_networks}
+    networks_with_devices |= parent_networks({subnet for record in devices for subnet in record.on_subnets})
+    
+    # Networks that have routing capability: where routers are located, the
+    # networks they serve, and networks reached through router subnets
+    networks_with_routers = {network for router in routers for network in on_network.get(router, ())}
+    networks_with_routers |= {network for router in routers for network in serves_network.get(router, ())}
+    networks_with_routers |= parent_networks({subnet for router in routers for subnet in on_subnet.get(router, ())})
     
     # If there are fewer than 2 networks with devices, no routing is needed
     if len(networks_with_devices) < 2:
@@ -78,9 +74,9 @@ def check_missing_routers(graph: Graph, verbose: bool = False) -> Tuple[List[Dic
         for network in isolated_networks:
             network_label = str(network)
             # Try to get a human-readable label
-            for _, _, label in graph.triples((network, URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
+            label = graph.value(network, RDFS_LABEL)
+            if label is not None:
                 network_label = str(label)
-                break
             
             network_details.append({
                 'network_uri': str(network),
@@ -8,10 +8,48 @@ BACnet Standard: Each device should have a vendor-id property that identifies
 the manufacturer. Vendor IDs should be numeric and registered with ASHRAE.
 """
 
-from typing import List, Tuple, Any, Dict
-from rdflib import Graph, URIRef
+from functools import lru_cache
+from typing import List, Tuple, Any, Dict, Optional
+from rdflib import Graph
 import rdflib.term
-from .utils import BACNET_NS
+from .utils import build_device_index
+
+
+# Vendor ID rules as (test, description template, verbose template). Templates
+# are filled with name, instance, address, vendor_id and numeric.
+_MISSING_RULE = (
+    None,
+    'Device {name} (instance {instance}) is missing vendor-id property',
+    'Device {name} (instance {instance}) at address {address} '
+    'does not have a vendor-id property. BACnet devices should include vendor identification '
+    'to assist with device management, troubleshooting, and interoperability. '
+    'Vendor IDs should be numeric values registered with ASHRAE.'
+)
+
+# Checked in order against the parsed numeric vendor ID; the first match is reported
+_VENDOR_RULES = [
+    (
+        lambda numeric: numeric is None,
+        'Device {name} (instance {instance}) has invalid vendor-id format: "{vendor_id}" (must be numeric or bacnet://vendor/N format)',
+        'Device {name} (instance {instance}) at address {address} '
+        'has an invalid vendor-id "{vendor_id}". BACnet vendor IDs must be positive integers '
+        'registered with ASHRAE, either as simple numbers like "123" or URI format like "bacnet://vendor/123".'
+    ),
+    (
+        lambda numeric: numeric < 0,
+        'Device {name} (instance {instance}) has invalid vendor-id: {numeric} (must be positive)',
+        'Device {name} (instance {instance}) at address {address} '
+        'has an invalid vendor-id value "{numeric}". BACnet vendor IDs must be positive integers '
+        'registered with ASHRAE. Negative values are not valid vendor identifiers.'
+    ),
+    (
+        lambda numeric: numeric == 0,
+        'Device {name} (instance {instance}) has invalid vendor-id: 0 (reserved value)',
+        'Device {name} (instance {instance}) at address {address} '
+        'has vendor-id "0" which is a reserved value. BACnet vendor IDs should be positive integers '
+        'registered with ASHRAE. Vendor ID 0 is not assigned to any manufacturer.'
+    ),
+]
 
 
 def check_missing_vendor_ids(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node]]:
@@ -30,156 +68,95 @@ def check_missing_vendor_ids(graph: Graph, verbose: bool = False) -> Tuple[List[
     affected_triples = []
     
     # Find all devices and check for vendor IDs
-    device_type = BACNET_NS['Device']
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
+    device_index = build_device_index(graph)
+    grasshopper_devices = device_index.grasshopper_devices
     
-    for device, _, _ in graph.triples((None, rdf_type, device_type)):
-        # Get device properties
-        device_name = None
-        device_instance = None
-        device_address = None
-        vendor_id = None
-        
-        # Extract device name/label
-        for _, _, label_value in graph.triples((device, URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
-            device_name = str(label_value)
-            break
+    for record in device_index.devices.values():
+        device = record.node
         
-        # Skip Grasshopper nodes - check both URI and label
-        device_uri = str(device)
-        if (device_name and "Grasshopper" in device_name) or "Grasshopper" in device_uri:
+        # Skip Grasshopper nodes (matched on URI or label)
+        if device in grasshopper_devices:
             continue
         
-        # Extract device instance
-        for _, _, instance_value in graph.triples((device, BACNET_NS['device-instance'], None)):
-            device_instance = str(instance_value)
-            break
-            
-        # Extract address
-        for _, _, address_value in graph.triples((device, BACNET_NS['address'], None)):
-            device_address = str(address_value)
-            break
+        # Get device properties
+        device_name = record.label
+        device_instance = record.instance
+        device_address = record.address
+        
+        # Extract vendor ID; devices from one vendor share the same value, so
+        # parsing and rule selection are cached per distinct string
+        vendor_id = record.vendor_id
+        if not vendor_id:
+            vendor_id_numeric, rule = None, _MISSING_RULE
+        else:
+            vendor_id_numeric, rule = _classify_vendor_id(vendor_id)
+            if rule is None:
+                # Note: We could add checks for known vendor ID ranges here if needed
+                # For now, we accept any positive integer as potentially valid
+                continue
         
-        # Extract vendor ID
-        vendor_id = None
-        vendor_id_numeric = None
-        for _, _, vendor_value in graph.triples((device, BACNET_NS['vendor-id'], None)):
-            vendor_id = str(vendor_value)
-            
-            # Extract numeric vendor ID from various formats
-            if vendor_id.startswith('bacnet://vendor/'):
-                # Handle URI format: bacnet://vendor/123
-                try:
-                    vendor_id_numeric = int(vendor_id.split('/')[-1])
-                except (ValueError, IndexError):
-                    vendor_id_numeric = None
-            else:
-                # Handle simple numeric format: "123"
-                try:
-                    vendor_id_numeric = int(vendor_id)
-                except (ValueError, TypeError):
-                    vendor_id_numeric = None
-            break
-            
         # Use defaults if not found
         final_device_name = device_name if device_name else f"Device {device_instance if device_instance else 'Unknown'}"
         final_device_instance = device_instance if device_instance else 'Unknown'
         final_device_address = device_address if device_address else 'Unknown'
         
-        # Check if vendor ID is missing
-        if not vendor_id:
-            issue = {
-                'issue_type': 'missing-vendor-ids',
-                'severity': 'medium',
-                'device': str(device),
-                'label': final_device_name,
-                'device_instance': final_device_instance,
-                'address': final_device_address,
-                'vendor_id': None,
-                'description': f'Device {final_device_name} (instance {final_device_instance}) is missing vendor-id property'
-            }
-            
-            if verbose:
-                issue['verbose_description'] = (
-                    f'Device {final_device_name} (instance {final_device_instance}) at address {final_device_address} '
-                    f'does not have a vendor-id property. BACnet devices should include vendor identification '
-                    f'to assist with device management, troubleshooting, and interoperability. '
-                    f'Vendor IDs should be numeric values registered with ASHRAE.'
-                )
-            
-            issues.append(issue)
-            affected_nodes.append(device)
-            continue
-        
-        # Validate vendor ID format and value
-        if vendor_id_numeric is None:
-            # Could not parse a numeric vendor ID
-            issue = {
-                'issue_type': 'missing-vendor-ids',
-                'severity': 'medium',
-                'device': str(device),
-                'label': final_device_name,
-                'device_instance': final_device_instance,
-                'address': final_device_address,
-                'vendor_id': vendor_id,
-                'description': f'Device {final_device_name} (instance {final_device_instance}) has invalid vendor-id format: "{vendor_id}" (must be numeric or bacnet://vendor/N format)'
-            }
-            
-            if verbose:
-                issue['verbose_description'] = (
-                    f'Device {final_device_name} (instance {final_device_instance}) at address {final_device_address} '
-                    f'has an invalid vendor-id "{vendor_id}". BACnet vendor IDs must be positive integers '
-                    f'registered with ASHRAE, either as simple numbers like "123" or URI format like "bacnet://vendor/123".'
-                )
-            
-            issues.append(issue)
-            affected_nodes.append(device)
-            continue
-            
-        # Check for invalid vendor ID values
-        if vendor_id_numeric < 0:
-            issue = {
-                'issue_type': 'missing-vendor-ids',
-                'severity': 'medium',
-                'device': str(device),
-                'label': final_device_name,
-                'device_instance': final_device_instance,
-                'address': final_device_address,
-                'vendor_id': vendor_id,
-                'description': f'Device {final_device_name} (instance {final_device_instance}) has invalid vendor-id: {vendor_id_numeric} (must be positive)'
-            }
-            
-            if verbose:
-                issue['verbose_description'] = (
-                    f'Device {final_device_name} (instance {final_device_instance}) at address {final_device_address} '
-                    f'has an invalid vendor-id value "{vendor_id_numeric}". BACnet vendor IDs must be positive integers '
-                    f'registered with ASHRAE. Negative values are not valid vendor identifiers.'
-                )
-            
-            issues.append(issue)
-            affected_nodes.append(device)
-        elif vendor_id_numeric == 0:
-            issue = {
-                'issue_type': 'missing-vendor-ids',
-                'severity': 'medium',
-                'device': str(device),
-                'label': final_device_name,
-                'device_instance': final_device_instance,
-                'address': final_device_address,
-                'vendor_id': vendor_id,
-                'description': f'Device {final_device_name} (instance {final_device_instance}) has invalid vendor-id: 0 (reserved value)'
-            }
-            
-            if verbose:
-                issue['verbose_description'] = (
-                    f'Device {final_device_name} (instance {final_device_instance}) at address {final_device_address} '
-                    f'has vendor-id "0" which is a reserved value. BACnet vendor IDs should be positive integers '
-                    f'registered with ASHRAE. Vendor ID 0 is not assigned to any manufacturer.'
-                )
-            
-            issues.append(issue)
-            affected_nodes.append(device)
-        # Note: We could add checks for known vendor ID ranges here if needed
-        # For now, we accept any positive integer as potentially valid
+        _, description_template, verbose_template = rule
+        fields = {
+            'name': final_device_name,
+            'instance': final_device_instance,
+            'address': final_device_address,
+            'vendor_id': vendor_id,
+            'numeric': vendor_id_numeric
+        }
+        issues.append(_make_vendor_issue(
+            record.uri,
+            final_device_name,
+            final_device_instance,
+            final_device_address,
+            vendor_id if vendor_id else None,
+            description_template.format(**fields),
+            verbose_template.format(**fields) if verbose else None
+        ))
+        affected_nodes.append(device)
     
     return issues, affected_triples, affected_nodes
+
+
+@lru_cache(maxsize=1024)
+def _classify_vendor_id(vendor_id: str) -> Tuple[Optional[int], Optional[tuple]]:
+    """Parse a vendor ID string and return (numeric value, first failing rule or None)."""
+    # Extract numeric vendor ID from various formats; the result is cached,
+    # so a failed int() is paid once per distinct string
+    if vendor_id.startswith('bacnet://vendor/'):
+        # Handle URI format: bacnet://vendor/123
+        numeric_part = vendor_id.split('/')[-1]
+    else:
+        # Handle simple numeric format: "123"
+        numeric_part = vendor_id
+    try:
+        vendor_id_numeric = int(numeric_part)
+    except ValueError:
+        vendor_id_numeric = None
+    rule = next((rule for rule in _VENDOR_RULES if rule[0](vendor_id_numeric)), None)
+    return vendor_id_numeric, rule
+
+
+def _make_vendor_issue(device_uri: str, label: str, device_instance: str, address: str,
+                       vendor_id: Optional[str], description: str,
+                       verbose_description: Optional[str] = None) -> Dict[str, Any]:
+    """Build a missing-vendor-ids issue dict."""
+    issue = {
+        'issue_type': 'missing-vendor-ids',
+        'severity': 'medium',
+        'device': device_uri,
+        'label': label,
+        'device_instance': device_instance,
+        'address': address,
+        'vendor_id': vendor_id,
+        'description': description
+    }
+    
+    if verbose_description is not None:
+        issue['verbose_description'] = verbose_description
+    
+    return issue
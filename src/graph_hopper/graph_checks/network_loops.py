@@ -2,12 +2,20 @@
 Network Loops Check - Phase 2.4
 
 Detects circular routing dependencies that can cause broadcast storms in BACnet networks.
-Uses Depth-First Search (DFS) to detect cycles in the network topology graph.
+Uses union-find over router connections to detect cycles in the network topology graph.
 """
 
-from typing import List, Set, Dict, Tuple, Any
-from rdflib import Graph, URIRef
-from collections import defaultdict
+from functools import lru_cache
+from typing import List, Set, Dict, Tuple, Any, Iterable, Iterator, Optional
+from rdflib import Graph
+import rdflib.term
+from collections import defaultdict, deque
+from .utils import BACNET_NS, RDF_TYPE, index_predicate
+
+
+_ROUTER = BACNET_NS['Router']
+_DEVICE_ON_NETWORK = BACNET_NS['device-on-network']
+_SERVES_NETWORK = BACNET_NS['serves-network']
 
 
 def check_network_loops(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], Set[str]]:
@@ -41,8 +49,8 @@ def check_network_loops(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[
         net1, net2 = networks[0], networks[1]
         
         # Check if both networks connect to each other (bidirectional)
-        if (net2 in network_graph.get(net1, []) and 
-            net1 in network_graph.get(net2, [])):
+        if (net2 in network_graph.get(net1, ()) and 
+            net1 in network_graph.get(net2, ())):
             
             # Find the routers causing this loop
             loop_routers = _find_routers_in_loop([net1, net2], router_connections)
@@ -92,9 +100,14 @@ def check_network_loops(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[
     return issues, affected_triples, affected_nodes
 
 
-def _find_cycles_union_find(graph: Dict[str, List[str]]) -> List[List[str]]:
+def _find_cycles_union_find(graph: Dict[str, Iterable[str]]) -> List[List[str]]:
     """
-    Find cycles using a modified approach that looks for redundant paths.
+    Find cycles using union-find over the network connections.
+    
+    Each undirected connection is merged into a disjoint-set forest. A
+    connection whose two networks are already in the same set is redundant
+    routing: it closes a loop, which is read off the spanning forest as the
+    path between its endpoints through their common ancestor.
     
     Args:
         graph: Adjacency list representation of network connectivity
@@ -103,76 +116,133 @@ def _find_cycles_union_find(graph: Dict[str, List[str]]) -> List[List[str]]:
         List of cycles found
     """
     cycles = []
-    all_nodes = list(graph.keys())
     
-    if len(all_nodes) < 3:
+    if len(graph) < 3:
         return cycles
     
-    # For each possible 3+ node combination, check if they form a cycle
-    visited_global = set()
+    # A loop of 3+ networks needs at least 3 connections. Comparing the edge
+    # count to the node count says nothing more on its own, since a graph
+    # split into several trees plus one loop can still have E < V.
+    edge_count = sum(map(len, graph.values())) // 2
+    if edge_count < 3:
+        return cycles
     
-    for start_node in all_nodes:
-        if start_node in visited_global:
-            continue
+    parent = {node: node for node in graph}
+    rank = dict.fromkeys(graph, 0)
+    
+    def find(node: str) -> str:
+        # Path halving: point every other node on the way at its grandparent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+    
+    tree: Dict[str, List[str]] = defaultdict(list)
+    closing_edges: List[Tuple[str, str]] = []
+    seen_edges: Set[frozenset] = set()
+    
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            edge = frozenset((node, neighbor))
+            if edge in seen_edges:
+                continue
+            seen_edges.add(edge)
+            parent.setdefault(neighbor, neighbor)
+            rank.setdefault(neighbor, 0)
             
-        # DFS to find cycles from this node
-        visited = set()
-        path = []
-        cycle = _dfs_cycle_detection(start_node, graph, visited, path, start_node)
-        
-        if cycle and len(cycle) >= 3:
+            root_a, root_b = find(node), find(neighbor)
+            if root_a == root_b:
+                closing_edges.append((node, neighbor))
+                continue
+            
+            # Union by rank
+            if rank[root_a] < rank[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            if rank[root_a] == rank[root_b]:
+                rank[root_a] += 1
+            tree[node].append(neighbor)
+            tree[neighbor].append(node)
+    
+    # Every connection joined two trees: the topology is a forest
+    if not closing_edges:
+        return cycles
+    
+    # Root the spanning forest once so every closing edge's loop (its
+    # fundamental cycle) is read off parent pointers up to the common ancestor
+    tree_parent, depth = _root_forest(tree)
+    
+    seen_cycles: Set[frozenset] = set()
+    for start, end in closing_edges:
+        cycle = _fundamental_cycle(tree_parent, depth, start, end)
+        key = frozenset(cycle)
+        if len(cycle) >= 3 and key not in seen_cycles:
+            seen_cycles.add(key)
             # Normalize the cycle (start with the lexicographically smallest node)
             min_idx = cycle.index(min(cycle))
-            normalized_cycle = cycle[min_idx:] + cycle[:min_idx]
-            
-            # Check if we've already found this cycle
-            if not any(set(normalized_cycle) == set(existing) for existing in cycles):
-                cycles.append(normalized_cycle)
-                visited_global.update(normalized_cycle)
-        
-        visited_global.add(start_node)
+            cycles.append(cycle[min_idx:] + cycle[:min_idx])
     
     return cycles
 
 
-def _dfs_cycle_detection(node: str, graph: Dict[str, List[str]], visited: Set[str], 
-                        path: List[str], target: str, depth: int = 0) -> List[str]:
+def _root_forest(tree: Dict[str, List[str]]) -> Tuple[Dict[str, Optional[str]], Dict[str, int]]:
     """
-    DFS to detect cycles back to target node.
+    Assign parents and depths to a spanning forest with one BFS per tree.
     
     Args:
-        node: Current node
-        graph: Adjacency list
-        visited: Visited nodes in current path
-        path: Current path
-        target: Target node to find cycle back to
-        depth: Current depth
+        tree: Adjacency list of the spanning forest
         
     Returns:
-        Cycle if found, empty list otherwise
+        Tuple of (parent map, depth map); roots have parent None and depth 0
     """
-    if depth > 5:  # Prevent infinite recursion
-        return []
-        
-    if node in visited:
-        return []
+    parent: Dict[str, Optional[str]] = {}
+    depth: Dict[str, int] = {}
+    for root in tree:
+        if root in parent:
+            continue
+        parent[root] = None
+        depth[root] = 0
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for neighbor in tree[node]:
+                if neighbor not in parent:
+                    parent[neighbor] = node
+                    depth[neighbor] = depth[node] + 1
+                    queue.append(neighbor)
+    return parent, depth
+
+
+def _fundamental_cycle(parent: Dict[str, Optional[str]], depth: Dict[str, int],
+                       start: str, end: str) -> List[str]:
+    """
+    Build the loop closed by a non-tree edge from the rooted spanning forest.
+    
+    Args:
+        parent: Parent map of the rooted forest
+        depth: Depth map of the rooted forest
+        start: First endpoint of the closing edge
+        end: Second endpoint (in the same tree as start)
         
-    visited.add(node)
-    path.append(node)
-    
-    for neighbor in graph.get(node, []):
-        if neighbor == target and len(path) >= 3:
-            # Found a cycle back to start
-            return path[:]
-        elif neighbor not in visited:
-            cycle = _dfs_cycle_detection(neighbor, graph, visited.copy(), path[:], target, depth + 1)
-            if cycle:
-                return cycle
-    
-    return []
+    Returns:
+        List of nodes from start through their common ancestor to end
+    """
+    up_from_start = [start]
+    up_from_end = [end]
+    # Climb the deeper side first, then both together until they meet
+    while depth[up_from_start[-1]] > depth[up_from_end[-1]]:
+        up_from_start.append(parent[up_from_start[-1]])
+    while depth[up_from_end[-1]] > depth[up_from_start[-1]]:
+        up_from_end.append(parent[up_from_end[-1]])
+    while up_from_start[-1] != up_from_end[-1]:
+        up_from_start.append(parent[up_from_start[-1]])
+        up_from_end.append(parent[up_from_end[-1]])
+    
+    up_from_end.pop()  # Common ancestor is already the last node of up_from_start
+    return up_from_start + up_from_end[::-1]
 
 
-def _build_network_graph_with_routers(graph: Graph) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+def _build_network_graph_with_routers(graph: Graph) -> Tuple[Dict[str, Dict[str, None]], Dict[Tuple[str, str], Dict[str, None]]]:
     """
     Build adjacency list representation of network connectivity from RDF graph,
     and track which routers connect which networks.
@@ -182,106 +252,126 @@ def _build_network_graph_with_routers(graph: Graph) -> Tuple[Dict[str, List[str]
         
     Returns:
         tuple: (network_adjacency_dict, router_connections_dict)
-            - network_adjacency_dict: keys are networks, values are connected networks
-            - router_connections_dict: maps connection_key -> list of routers connecting them
+            - network_adjacency_dict: keys are networks, values hold connected networks as ordered keys
+            - router_connections_dict: maps (from_network, to_network) -> routers connecting them, as ordered keys
     """
-    bacnet_ns = URIRef("http://data.ashrae.org/bacnet/2020#")
-    router_class = bacnet_ns + "Router"
-    device_on_network = bacnet_ns + "device-on-network"
-    serves_network = bacnet_ns + "serves-network"
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
-    
-    network_graph = defaultdict(list)
+    # Neighbors and routers are collected as dict keys: O(1) dedupe that keeps
+    # insertion order, so the reported loops stay deterministic
+    network_graph = defaultdict(dict)
     # Track which routers connect which pairs of networks
-    router_connections = defaultdict(list)
+    router_connections = defaultdict(dict)
+    
+    network_strs: Dict[rdflib.term.Node, str] = {}
     
     # Find all routers and their network connections
-    for router in graph.subjects(rdf_type, router_class):
-        # Get the network this router is on
-        source_networks = list(graph.objects(router, device_on_network))
-        # Get the networks this router serves
-        target_networks = list(graph.objects(router, serves_network))
-        
+    for router, source_networks, target_networks in _router_network_links(graph):
         router_str = str(router)
         
         # Create bidirectional connections between source and target networks
-        for source_net in source_networks:
-            for target_net in target_networks:
-                source_str = str(source_net)
-                target_str = str(target_net)
+        target_strs = _network_strings(target_networks, network_strs)
+        for source_str in _network_strings(source_networks, network_strs):
+            for target_str in target_strs:
                 
                 # Add bidirectional edges to network graph
-                if target_str not in network_graph[source_str]:
-                    network_graph[source_str].append(target_str)
-                if source_str not in network_graph[target_str]:
-                    network_graph[target_str].append(source_str)
+                network_graph[source_str][target_str] = None
+                network_graph[target_str][source_str] = None
                 
                 # Track which router connects these networks (both directions)
-                connection_key_1 = f"{source_str}→{target_str}"
-                connection_key_2 = f"{target_str}→{source_str}"
-                
-                if router_str not in router_connections[connection_key_1]:
-                    router_connections[connection_key_1].append(router_str)
-                if router_str not in router_connections[connection_key_2]:
-                    router_connections[connection_key_2].append(router_str)
+                router_connections[(source_str, target_str)][router_str] = None
+                router_connections[(target_str, source_str)][router_str] = None
+    
+    # Hand the collections back as they are; clearing the default factory
+    # stops lookups from inserting keys, without copying every entry
+    network_graph.default_factory = None
+    router_connections.default_factory = None
+    return network_graph, router_connections
+
+
+def _router_network_links(graph: Graph) -> Iterator[Tuple[rdflib.term.Node, List[rdflib.term.Node], List[rdflib.term.Node]]]:
+    """
+    Yield each router that links networks, with the networks it is on and the networks it serves.
     
-    return dict(network_graph), dict(router_connections)
+    Each link predicate is fetched in a single scan instead of being probed per router.
+    """
+    networks_on = index_predicate(graph, _DEVICE_ON_NETWORK)
+    networks_served = index_predicate(graph, _SERVES_NETWORK)
+    for router in graph.subjects(RDF_TYPE, _ROUTER):
+        source_networks = networks_on.get(router)
+        target_networks = networks_served.get(router)
+        if source_networks and target_networks:
+            yield router, source_networks, target_networks
+
+
+def _network_strings(networks: List[rdflib.term.Node], cache: Dict[rdflib.term.Node, str]) -> List[str]:
+    """Convert network nodes to strings, converting each distinct node once."""
+    result = []
+    for network in networks:
+        network_str = cache.get(network)
+        if network_str is None:
+            network_str = cache[network] = str(network)
+        result.append(network_str)
+    return result
 
 
-def _find_routers_in_loop(networks_in_loop: List[str], router_connections: Dict[str, List[str]]) -> List[Dict[str, str]]:
+def _find_routers_in_loop(networks_in_loop: List[str], router_connections: Dict[Tuple[str, str], Dict[str, None]]) -> List[Dict[str, str]]:
     """
     Find the routers that are causing the network loop.
     
     Args:
         networks_in_loop: List of network URIs that form the loop
-        router_connections: Dict mapping network connection keys to router lists
+        router_connections: Dict mapping (from_network, to_network) pairs to their routers
         
     Returns:
         List of router information dicts with connection details
     """
     loop_routers = []
+    seen_routers: Set[str] = set()
     
     # Check connections between adjacent networks in the loop
     for i in range(len(networks_in_loop)):
         current_net = networks_in_loop[i]
         next_net = networks_in_loop[(i + 1) % len(networks_in_loop)]
         
-        connection_key = f"{current_net}→{next_net}"
-        routers = router_connections.get(connection_key, [])
+        routers = router_connections.get((current_net, next_net), ())
+        if not routers:
+            continue
+        
+        # Network names are shared by every router on this edge
+        from_name = _get_network_name(current_net)
+        to_name = _get_network_name(next_net)
         
         for router in routers:
-            router_info = {
+            # Avoid duplicates
+            if router in seen_routers:
+                continue
+            seen_routers.add(router)
+            
+            loop_routers.append({
                 'router_uri': router,
                 'router_name': _get_router_name(router),
-                'connects_from': _get_network_name(current_net),
-                'connects_to': _get_network_name(next_net),
+                'connects_from': from_name,
+                'connects_to': to_name,
                 'connection_type': 'bidirectional routing'
-            }
-            
-            # Avoid duplicates
-            if not any(existing['router_uri'] == router for existing in loop_routers):
-                loop_routers.append(router_info)
+            })
     
     return loop_routers
 
 
+@lru_cache(maxsize=4096)
 def _get_router_name(router_uri: str) -> str:
     """Get human-readable name for a router."""
     # Extract router identifier from URI
-    if '/' in router_uri:
-        return router_uri.split('/')[-1]
-    return router_uri
+    return router_uri.rpartition('/')[2]
 
 
+@lru_cache(maxsize=4096)
 def _get_network_name(network_uri: str) -> str:
     """Get human-readable name for a network."""
-    # Extract network identifier from URI  
-    if '/' in network_uri:
-        return network_uri.split('/')[-1]
-    return network_uri
+    # Extract network identifier from URI
+    return network_uri.rpartition('/')[2]
 
 
-def _build_network_graph(graph: Graph) -> Dict[str, List[str]]:
+def _build_network_graph(graph: Graph) -> Dict[str, Dict[str, None]]:
     """
     Build adjacency list representation of network connectivity from RDF graph.
     
@@ -289,33 +379,22 @@ def _build_network_graph(graph: Graph) -> Dict[str, List[str]]:
         graph: RDFLib graph containing router and network relationships
         
     Returns:
-        dict: adjacency list where keys are networks and values are connected networks
+        dict: adjacency where keys are networks and values hold connected networks as ordered keys
     """
-    bacnet_ns = URIRef("http://data.ashrae.org/bacnet/2020#")
-    router_class = bacnet_ns + "Router"
-    device_on_network = bacnet_ns + "device-on-network"
-    serves_network = bacnet_ns + "serves-network"
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
+    network_graph = defaultdict(dict)  # network -> neighbors as ordered dict keys
     
-    network_graph = defaultdict(list)
+    network_strs: Dict[rdflib.term.Node, str] = {}
     
     # Find all routers and their network connections
-    for router in graph.subjects(rdf_type, router_class):
-        # Get the network this router is on
-        source_networks = list(graph.objects(router, device_on_network))
-        # Get the networks this router serves
-        target_networks = list(graph.objects(router, serves_network))
-        
+    for router, source_networks, target_networks in _router_network_links(graph):
         # Create bidirectional connections between source and target networks
-        for source_net in source_networks:
-            for target_net in target_networks:
-                source_str = str(source_net)
-                target_str = str(target_net)
+        target_strs = _network_strings(target_networks, network_strs)
+        for source_str in _network_strings(source_networks, network_strs):
+            for target_str in target_strs:
                 
                 # Add bidirectional edges
-                if target_str not in network_graph[source_str]:
-                    network_graph[source_str].append(target_str)
-                if source_str not in network_graph[target_str]:
-                    network_graph[target_str].append(source_str)
+                network_graph[source_str][target_str] = None
+                network_graph[target_str][source_str] = None
     
-    return dict(network_graph)
\ No newline at end of file
+    network_graph.default_factory = None
+    return network_graph
\ No newline at end of file
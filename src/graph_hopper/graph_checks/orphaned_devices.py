@@ -9,7 +9,7 @@ from typing import List, Dict, Any, Tuple
 import rdflib
 from rdflib import Graph
 
-from .utils import BACNET_NS
+from .utils import build_device_index
 
 
 def check_orphaned_devices(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node]]:
@@ -34,71 +34,63 @@ def check_orphaned_devices(graph: Graph, verbose: bool = False) -> Tuple[List[Di
     affected_nodes: List[rdflib.term.Node] = []
     affected_triples = []
     
-    # Find all devices (specifically ns1:Device type, not routers or BBMDs)
-    device_type = BACNET_NS['Device']
+    # Find all devices (specifically ns1:Device type, not routers or BBMDs);
+    # their properties were gathered in one pass over the graph
+    device_index = build_device_index(graph)
     
-    for device, _, _ in graph.triples((None, rdflib.URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type"), device_type)):
-        # Get device properties
-        label = None
-        instance = None
-        address = None
+    for record in device_index.devices.values():
+        # Device is orphaned if it has neither network nor subnet connection;
+        # connected devices are the common case, so skip them before anything else
+        if record.on_networks or record.on_subnets:
+            continue
+        
+        device = record.node
         
-        # Extract label
-        for _, _, label_value in graph.triples((device, rdflib.URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
-            label = str(label_value)
-            break
+        # Get device properties
+        label = record.label
         if not label:
-            label = str(device)
+            label = record.uri
             
         # Extract device instance
-        for _, _, instance_value in graph.triples((device, BACNET_NS['device-instance'], None)):
-            instance = str(instance_value)
-            break
+        instance = record.instance
         if not instance:
             instance = "unknown"
             
         # Extract address
-        for _, _, address_value in graph.triples((device, BACNET_NS['address'], None)):
-            address = str(address_value)
-            break
+        address = record.address
         if not address:
             address = "unknown"
         
-        # Check if device has network connectivity
-        has_network = bool(list(graph.triples((device, BACNET_NS['device-on-network'], None))))
-        has_subnet = bool(list(graph.triples((device, BACNET_NS['device-on-subnet'], None))))
+        issue: Dict[str, Any] = {
+            'issue_type': 'orphaned-device',
+            'severity': 'critical',
+            'device': record.uri,
+            'label': label,
+            'device_instance': instance,
+            'address': address,
+            'description': f'Device {label} (instance {instance}) is not connected to any network or subnet'
+        }
         
-        # Device is orphaned if it has neither network nor subnet connection
-        if not has_network and not has_subnet:
-            issue: Dict[str, Any] = {
-                'issue_type': 'orphaned-device',
-                'severity': 'critical',
-                'device': str(device),
-                'label': label,
-                'device_instance': instance,
-                'address': address,
-                'description': f'Device {label} (instance {instance}) is not connected to any network or subnet'
-            }
+        if verbose:
+            # Get all triples for this device to show what properties it has
+            device_triples = [
+                {
+                    'subject': record.uri,
+                    'predicate': str(predicate),
+                    'object': str(obj)
+                }
+                for predicate, objs in record.properties.items()
+                for obj in objs
+            ]
+            issue['triples'] = device_triples
             
-            if verbose:
-                # Get all triples for this device to show what properties it has
-                device_triples = list(graph.triples((device, None, None)))
-                issue['triples'] = [
-                    {
-                        'subject': str(triple[0]),
-                        'predicate': str(triple[1]),
-                        'object': str(triple[2])
-                    }
-                    for triple in device_triples
-                ]
-                
-                issue['verbose_description'] = (
-                    f'Device {label} (URI: {device}) has {len(device_triples)} properties '
-                    f'but lacks both ns1:device-on-network and ns1:device-on-subnet connections. '
-                    f'This device cannot communicate with other devices on the BACnet network.'
-                )
-            
-            issues.append(issue)
-            affected_nodes.append(device)
+            issue['verbose_description'] = (
+                f'Device {label} (URI: {device}) has {len(device_triples)} properties '
+                f'but lacks both ns1:device-on-network and ns1:device-on-subnet connections. '
+                f'This device cannot communicate with other devices on the BACnet network.'
+            )
+        
+        issues.append(issue)
+        affected_nodes.append(device)
     
     return issues, affected_triples, affected_nodes
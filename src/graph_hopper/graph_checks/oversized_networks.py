@@ -8,12 +8,107 @@ Network-type-aware thresholds based on BACnet best practices:
 - Other Networks: Warning: 25+ devices, Critical: 50+ devices (conservative default)
 """
 
-from typing import List, Set, Dict, Tuple, Any
-from rdflib import Graph, URIRef
+import re
+from typing import List, Set, Dict, Tuple, Any, Optional
+from rdflib import Graph
+import rdflib.term
 from collections import defaultdict
+from itertools import islice
+from .utils import BACNET_NS, RDF_TYPE, RDFS_LABEL, index_predicate
 
 
-def check_oversized_networks(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], Set[str]]:
+_NETWORK_CLASS = BACNET_NS['BACnetNetwork']
+_DEVICE_ON_NETWORK = BACNET_NS['device-on-network']
+_DEVICE_ON_SUBNET = BACNET_NS['device-on-subnet']
+_SUBNET_OF_NETWORK = BACNET_NS['subnet-of-network']
+_NETWORK_NUMBER = BACNET_NS['network-number']
+_NETWORK_TYPE = BACNET_NS['network-type']
+_ADDRESS = BACNET_NS['address']
+
+# Warning and critical device counts per network type
+_THRESHOLDS = {
+    'mstp': (15, 30),      # MSTP networks - token passing limitations
+    'ip': (50, 100),       # IP networks - higher capacity 
+    'ethernet': (50, 100), # Ethernet networks - treat like IP
+    'arcnet': (15, 25),    # ARCNET - token passing like MSTP
+    'ptp': (2, 3),         # Point-to-point - should only have 2 devices
+    'other': (25, 50)      # Conservative default for unknown types
+}
+
+# No network below this many devices can be oversized, whatever its type
+_MIN_WARNING_THRESHOLD = min(warning for warning, _ in _THRESHOLDS.values())
+
+# Recommendation templates keyed by (network type, severity tier); types
+# without their own entry use the 'other' templates
+_PTP_RECOMMENDATION = (
+    "Point-to-Point networks should only have 2 devices. "
+    "Current configuration with {device_count} devices indicates a network topology issue. "
+    "Verify network configuration and consider using a different network type."
+)
+_RECOMMENDATION_TEMPLATES = {
+    ('mstp', 'critical'): (
+        "CRITICAL: MSTP networks with {device_count} devices severely impact token passing performance. "
+        "Immediately segment this network. MSTP best practices recommend max 15-20 devices per segment. "
+        "Consider splitting into multiple MSTP segments or migrating high-traffic devices to IP networks. "
+        "Token circulation time increases exponentially with device count."
+    ),
+    ('mstp', 'warning'): (
+        "MSTP network approaching capacity limits. Consider segmentation before reaching {critical_threshold} devices. "
+        "MSTP token-passing protocol becomes increasingly inefficient with more devices. "
+        "Monitor response times and consider splitting the network if delays are observed."
+    ),
+    ('ip', 'critical'): (
+        "Immediately segment this IP network. Consider implementing VLANs or subnets with {half_warning}-{warning_threshold} devices each. "
+        "Use routers to connect segments and implement BBMD (BACnet Broadcast Management Device) "
+        "to control broadcast traffic across network boundaries."
+    ),
+    ('ip', 'warning'): (
+        "Consider segmenting this IP network before reaching {critical_threshold} devices. "
+        "Target {half_warning}-{two_thirds_warning:.0f} devices per subnet for optimal performance. "
+        "Monitor broadcast traffic and network response times."
+    ),
+    ('ptp', 'critical'): _PTP_RECOMMENDATION,
+    ('ptp', 'warning'): _PTP_RECOMMENDATION,
+    ('other', 'critical'): (
+        "Network has reached critical device density. Implement network segmentation immediately. "
+        "Consider splitting into segments with {half_warning}-{warning_threshold} devices each. "
+        "Use appropriate routing/bridging based on the physical network type."
+    ),
+    ('other', 'warning'): (
+        "Monitor network performance and consider segmentation as device count approaches {critical_threshold}. "
+        "Network type '{network_type}' may have specific constraints - consult vendor documentation."
+    ),
+}
+
+# Keyword patterns per detection method, in priority order. A string gets the
+# first type whose pattern appears anywhere in it, as with plain substring tests
+_TYPE_PROPERTY_PATTERNS = (
+    ('mstp', re.compile(r'mstp|master-slave|token-passing')),
+    ('ip', re.compile(r'ip|ethernet')),
+    ('arcnet', re.compile(r'arcnet')),
+    ('ptp', re.compile(r'ptp|point-to-point')),
+)
+_TYPE_LABEL_PATTERNS = (
+    ('mstp', re.compile(r'mstp|master-slave|token')),
+    ('ip', re.compile(r'ip|ethernet|tcp')),
+    ('arcnet', re.compile(r'arcnet')),
+    ('ptp', re.compile(r'ptp|point-to-point')),
+)
+_TYPE_URI_PATTERNS = (
+    ('mstp', re.compile(r'mstp|master-slave')),
+    ('ip', re.compile(r'ip|ethernet')),
+    ('arcnet', re.compile(r'arcnet')),
+    ('ptp', re.compile(r'ptp')),
+)
+
+# Dotted-quad IPv4 address with an optional port; octet ranges are checked separately
+_IPV4_RE = re.compile(r'(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})(?::\d+)?$')
+
+# Number of device addresses sampled when inferring a network's type
+_ADDRESS_SAMPLE_SIZE = 10
+
+
+def check_oversized_networks(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node], Set[str]]:
     """
     Check for networks with too many devices that could impact performance.
     
@@ -33,34 +128,29 @@ def check_oversized_networks(graph: Graph, verbose: bool = False) -> Tuple[List[
     affected_nodes = set()
     affected_triples = []
     
-    # Build network device count mapping
-    bacnet_ns = URIRef("http://data.ashrae.org/bacnet/2020#")
-    network_class = bacnet_ns + "BACnetNetwork"
-    device_on_network = bacnet_ns + "device-on-network"
-    device_on_subnet = bacnet_ns + "device-on-subnet"
-    subnet_of_network = bacnet_ns + "subnet-of-network"
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
-    
-    # Find all networks
-    networks = set()
-    for network, _, _ in graph.triples((None, rdf_type, network_class)):
-        networks.add(network)
-    
-    if not networks:
+    # Find all networks, bailing out before the full scan when there are none
+    networks_iter = graph.subjects(RDF_TYPE, _NETWORK_CLASS)
+    first_network = next(networks_iter, None)
+    if first_network is None:
         return issues, affected_triples, affected_nodes
+    networks = {first_network}
+    networks.update(networks_iter)
     
     # Count devices per network
     network_device_counts = defaultdict(set)  # Use set to avoid double-counting
     
     # Count devices directly on networks
-    for device, _, network in graph.triples((None, device_on_network, None)):
+    for device, network in graph.subject_objects(_DEVICE_ON_NETWORK):
         if network in networks:
             network_device_counts[network].add(device)
     
+    # Map each subnet to its parent networks once, rather than per device
+    subnet_networks = index_predicate(graph, _SUBNET_OF_NETWORK)
+    
     # Count devices on subnets (these count toward the parent network)
-    for device, _, subnet in graph.triples((None, device_on_subnet, None)):
+    for device, subnet in graph.subject_objects(_DEVICE_ON_SUBNET):
         # Find which network this subnet belongs to
-        for _, _, network in graph.triples((subnet, subnet_of_network, None)):
+        for network in subnet_networks.get(subnet, ()):
             if network in networks:
                 network_device_counts[network].add(device)
     
@@ -68,6 +158,10 @@ def check_oversized_networks(graph: Graph, verbose: bool = False) -> Tuple[List[
     for network, devices in network_device_counts.items():
         device_count = len(devices)
         
+        # Type detection probes the graph, so skip networks too small to flag
+        if device_count < _MIN_WARNING_THRESHOLD:
+            continue
+        
         # Detect network type and set appropriate thresholds
         network_type = _detect_network_type(graph, network, devices)
         warning_threshold, critical_threshold = _get_thresholds_for_type(network_type)
@@ -87,12 +181,13 @@ def check_oversized_networks(graph: Graph, verbose: bool = False) -> Tuple[List[
         else:
             continue  # No issue
         
+        network_str = str(network)
         network_name = _get_network_name(graph, network)
         
         issue = {
             'issue_type': issue_type,
             'severity': severity,
-            'network': str(network),
+            'network': network_str,
             'network_name': network_name,
             'network_type': network_type,
             'device_count': device_count,
@@ -117,26 +212,26 @@ def check_oversized_networks(graph: Graph, verbose: bool = False) -> Tuple[List[
             )
         
         issues.append(issue)
-        affected_nodes.add(str(network))
+        affected_nodes.add(network_str)
     
     return issues, affected_triples, affected_nodes
 
 
 def _get_network_name(graph: Graph, network) -> str:
     """Get human-readable name for a network."""
-    rdfs_label = URIRef("http://www.w3.org/2000/01/rdf-schema#label")
-    bacnet_ns = URIRef("http://data.ashrae.org/bacnet/2020#")
-    
     # Try to get the label
-    for _, _, label_value in graph.triples((network, rdfs_label, None)):
+    label_value = graph.value(network, RDFS_LABEL)
+    if label_value is not None:
         return str(label_value)
     
     # Try to get network number
-    for _, _, number_value in graph.triples((network, bacnet_ns + "network-number", None)):
+    number_value = graph.value(network, _NETWORK_NUMBER)
+    if number_value is not None:
         return f"Network {number_value}"
     
     # Fallback to URI
-    return str(network).split('/')[-1] if '/' in str(network) else str(network)
+    network_str = str(network)
+    return network_str.split('/')[-1] if '/' in network_str else network_str
 
 
 def _detect_network_type(graph: Graph, network, devices: Set) -> str:
@@ -152,80 +247,42 @@ def _detect_network_type(graph: Graph, network, devices: Set) -> str:
     Returns:
         Network type: 'mstp', 'ip', 'ethernet', or 'other'
     """
-    bacnet_ns = URIRef("http://data.ashrae.org/bacnet/2020#")
-    rdfs_label = URIRef("http://www.w3.org/2000/01/rdf-schema#label")
-    
     # Method 1: Check for explicit network-type property
-    network_type_prop = bacnet_ns + "network-type"
-    for _, _, type_value in graph.triples((network, network_type_prop, None)):
-        type_str = str(type_value).lower()
-        if 'mstp' in type_str or 'master-slave' in type_str or 'token-passing' in type_str:
-            return 'mstp'
-        elif 'ip' in type_str or 'ethernet' in type_str or 'bacnet/ip' in type_str:
-            return 'ip'
-        elif 'arcnet' in type_str:
-            return 'arcnet'
-        elif 'ptp' in type_str or 'point-to-point' in type_str:
-            return 'ptp'
+    for type_value in graph.objects(network, _NETWORK_TYPE):
+        network_type = _match_network_type(str(type_value), _TYPE_PROPERTY_PATTERNS)
+        if network_type:
+            return network_type
     
     # Method 2: Analyze network label
-    for _, _, label_value in graph.triples((network, rdfs_label, None)):
-        label_str = str(label_value).lower()
-        if 'mstp' in label_str or 'master-slave' in label_str or 'token' in label_str:
-            return 'mstp'
-        elif 'ip' in label_str or 'ethernet' in label_str or 'tcp' in label_str:
-            return 'ip'
-        elif 'arcnet' in label_str:
-            return 'arcnet'
-        elif 'ptp' in label_str or 'point-to-point' in label_str:
-            return 'ptp'
+    for label_value in graph.objects(network, RDFS_LABEL):
+        network_type = _match_network_type(str(label_value), _TYPE_LABEL_PATTERNS)
+        if network_type:
+            return network_type
     
     # Method 3: Analyze network URI
-    network_uri = str(network).lower()
-    if 'mstp' in network_uri or 'master-slave' in network_uri:
-        return 'mstp'
-    elif 'ip' in network_uri or 'ethernet' in network_uri:
-        return 'ip'
-    elif 'arcnet' in network_uri:
-        return 'arcnet'
-    elif 'ptp' in network_uri:
-        return 'ptp'
-    
-    # Method 4: Analyze device addresses to infer network type
-    device_addresses = []
-    address_prop = bacnet_ns + "address"
-    
-    for device in devices:
-        for _, _, addr_value in graph.triples((device, address_prop, None)):
-            device_addresses.append(str(addr_value))
+    network_type = _match_network_type(str(network), _TYPE_URI_PATTERNS)
+    if network_type:
+        return network_type
+    
+    # Method 4: Analyze device addresses to infer network type. Only a sample
+    # is classified, so stop reading addresses once it is full
+    device_addresses = [
+        str(addr_value) for addr_value in islice(
+            (addr for device in devices for addr in graph.objects(device, _ADDRESS)),
+            _ADDRESS_SAMPLE_SIZE
+        )
+    ]
     
     if device_addresses:
         ip_addresses = 0
         numeric_addresses = 0
         
-        for addr in device_addresses[:10]:  # Sample first 10 addresses
-            # Check if it looks like an IP address (contains dots and numbers)
-            if '.' in addr and any(c.isdigit() for c in addr):
-                # More sophisticated IP address check
-                parts = addr.split('.')
-                if len(parts) == 4:
-                    try:
-                        all([0 <= int(p) <= 255 for p in parts])
-                        ip_addresses += 1
-                        continue
-                    except ValueError:
-                        pass
-                # Could be IP:port format like "192.168.1.1:47808"
-                elif ':' in addr:
-                    ip_part = addr.split(':')[0]
-                    parts = ip_part.split('.')
-                    if len(parts) == 4:
-                        try:
-                            all([0 <= int(p) <= 255 for p in parts])
-                            ip_addresses += 1
-                            continue
-                        except ValueError:
-                            pass
+        for addr in device_addresses:
+            # Check if it's an IPv4 address, optionally in IP:port format like "192.168.1.1:47808"
+            match = _IPV4_RE.match(addr)
+            if match and all(int(octet) <= 255 for octet in match.groups()):
+                ip_addresses += 1
+                continue
             
             # Check if it's a simple numeric address (typical for MSTP)
             if addr.isdigit() and 1 <= int(addr) <= 127:
@@ -242,6 +299,15 @@ def _detect_network_type(graph: Graph, network, devices: Set) -> str:
     return 'other'
 
 
+def _match_network_type(text: str, patterns) -> Optional[str]:
+    """Return the first network type whose keyword pattern occurs in text."""
+    text = text.lower()
+    for network_type, pattern in patterns:
+        if pattern.search(text):
+            return network_type
+    return None
+
+
 def _get_thresholds_for_type(network_type: str) -> Tuple[int, int]:
     """
     Get warning and critical thresholds based on network type.
@@ -256,87 +322,35 @@ def _get_thresholds_for_type(network_type: str) -> Tuple[int, int]:
     Returns:
         Tuple of (warning_threshold, critical_threshold)
     """
-    thresholds = {
-        'mstp': (15, 30),      # MSTP networks - token passing limitations
-        'ip': (50, 100),       # IP networks - higher capacity 
-        'ethernet': (50, 100), # Ethernet networks - treat like IP
-        'arcnet': (15, 25),    # ARCNET - token passing like MSTP
-        'ptp': (2, 3),         # Point-to-point - should only have 2 devices
-        'other': (25, 50)      # Conservative default for unknown types
-    }
-    
-    return thresholds.get(network_type, thresholds['other'])
+    return _THRESHOLDS.get(network_type, _THRESHOLDS['other'])
 
 
 def _get_recommendation(device_count: int, network_type: str, warning_threshold: int, critical_threshold: int) -> str:
     """Generate network-type-aware recommendations for oversized networks."""
-    
-    if network_type == 'mstp':
-        if device_count >= critical_threshold:
-            return (
-                f"CRITICAL: MSTP networks with {device_count} devices severely impact token passing performance. "
-                f"Immediately segment this network. MSTP best practices recommend max 15-20 devices per segment. "
-                f"Consider splitting into multiple MSTP segments or migrating high-traffic devices to IP networks. "
-                f"Token circulation time increases exponentially with device count."
-            )
-        else:  # warning level
-            return (
-                f"MSTP network approaching capacity limits. Consider segmentation before reaching {critical_threshold} devices. "
-                f"MSTP token-passing protocol becomes increasingly inefficient with more devices. "
-                f"Monitor response times and consider splitting the network if delays are observed."
-            )
-    
-    elif network_type == 'ip':
-        if device_count >= critical_threshold:
-            return (
-                f"Immediately segment this IP network. Consider implementing VLANs or subnets with {warning_threshold//2}-{warning_threshold} devices each. "
-                f"Use routers to connect segments and implement BBMD (BACnet Broadcast Management Device) "
-                f"to control broadcast traffic across network boundaries."
-            )
-        else:  # warning level
-            return (
-                f"Consider segmenting this IP network before reaching {critical_threshold} devices. "
-                f"Target {warning_threshold//2}-{warning_threshold//1.5:.0f} devices per subnet for optimal performance. "
-                f"Monitor broadcast traffic and network response times."
-            )
-    
-    elif network_type == 'ptp':
-        return (
-            f"Point-to-Point networks should only have 2 devices. "
-            f"Current configuration with {device_count} devices indicates a network topology issue. "
-            f"Verify network configuration and consider using a different network type."
-        )
-    
-    else:  # other/unknown network types
-        if device_count >= critical_threshold:
-            return (
-                f"Network has reached critical device density. Implement network segmentation immediately. "
-                f"Consider splitting into segments with {warning_threshold//2}-{warning_threshold} devices each. "
-                f"Use appropriate routing/bridging based on the physical network type."
-            )
-        else:  # warning level
-            return (
-                f"Monitor network performance and consider segmentation as device count approaches {critical_threshold}. "
-                f"Network type '{network_type}' may have specific constraints - consult vendor documentation."
-            )
+    tier = 'critical' if device_count >= critical_threshold else 'warning'
+    template = _RECOMMENDATION_TEMPLATES.get((network_type, tier), _RECOMMENDATION_TEMPLATES[('other', tier)])
+    return template.format(
+        device_count=device_count,
+        network_type=network_type,
+        warning_threshold=warning_threshold,
+        critical_threshold=critical_threshold,
+        half_warning=warning_threshold // 2,
+        two_thirds_warning=warning_threshold // 1.5
+    )
 
 
 def _get_device_breakdown(graph: Graph, devices: Set) -> Dict[str, Any]:
     """Get detailed breakdown of devices on the network."""
-    device_types = defaultdict(int)
+    # Only a sample of device names is reported, so stop once it is full
     device_list = []
-    
-    for device in devices:
-        # Get device type/name
-        device_name = str(device).split('/')[-1] if '/' in str(device) else str(device)
-        device_list.append(device_name)
-        
-        # Count by type (simplified - could be enhanced with more specific device type detection)
-        device_types['BACnetDevice'] += 1
+    for device in islice(devices, 10):
+        device_str = str(device)
+        device_list.append(device_str.split('/')[-1] if '/' in device_str else device_str)
     
     return {
         'total_devices': len(devices),
-        'device_types': dict(device_types),
-        'sample_devices': device_list[:10],  # Show first 10 as sample
-        'truncated': len(device_list) > 10
+        # Count by type (simplified - could be enhanced with more specific device type detection)
+        'device_types': {'BACnetDevice': len(devices)},
+        'sample_devices': device_list,  # Show first 10 as sample
+        'truncated': len(devices) > 10
     }
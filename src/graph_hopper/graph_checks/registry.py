@@ -5,26 +5,39 @@ This module provides a centralized registry of all available check types,
 allowing for dynamic CLI option generation and automatic check execution.
 """
 
-from typing import Dict, List, Tuple, Any
+import importlib
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Any
 from rdflib import Graph
-import rdflib
+from .utils import shared_device_index
 
-# Import all check functions
-from .duplicate_devices import check_duplicate_device_ids
-from .duplicate_networks import check_duplicate_networks  
-from .duplicate_bbmds import check_duplicate_bbmds
-from .orphaned_devices import check_orphaned_devices
-from .invalid_device_ranges import check_invalid_device_ranges
-from .device_address_conflicts import check_device_address_conflicts
-from .missing_vendor_ids import check_missing_vendor_ids
-from .missing_properties import check_missing_properties
-from .unreachable_networks import check_unreachable_networks
-from .missing_routers import check_missing_routers
-from .subnet_mismatches import check_subnet_mismatches
-from .network_loops import check_network_loops
-from .oversized_networks import check_oversized_networks
-from .broadcast_domains import check_broadcast_domains
-from .routing_inefficiencies import check_routing_inefficiencies
+
+@dataclass(slots=True, frozen=True)
+class CheckMeta:
+    """
+    Metadata for one registered issue type.
+    
+    Issue types that share a function_ref are reported together by a single
+    call to that function, and are resolved and executed as one group.
+    """
+    function_ref: str  # 'module:function' within graph_checks, imported on first use
+    description: str
+    category: str
+    
+    @property
+    def function(self) -> Callable:
+        """The check function, importing its module if needed."""
+        return _load_check(self.function_ref)
+
+
+@lru_cache(maxsize=None)
+def _load_check(function_ref: str) -> Callable:
+    """Import a check function from its 'module:function' reference."""
+    module_name, _, function_name = function_ref.partition(':')
+    module = importlib.import_module(f'.{module_name}', __package__)
+    return getattr(module, function_name)
 
 
 class CheckRegistry:
@@ -32,192 +45,176 @@ class CheckRegistry:
     
     def __init__(self):
         # Registry mapping issue type name to check function and metadata
-        self._checks: Dict[str, Dict[str, Any]] = {
-            'duplicate-device-id': {
-                'function': check_duplicate_device_ids,
-                'description': 'Detect devices with same ID across different networks/subnets',
-                'category': 'device-conflicts',
-                'single_check': True  # Returns issues for one type only
-            },
-            'orphaned-devices': {
-                'function': check_orphaned_devices,
-                'description': 'Detect devices not connected to any network or subnet',
-                'category': 'connectivity',
-                'single_check': True  # Returns issues for one type only
-            },
-            'invalid-device-ranges': {
-                'function': check_invalid_device_ranges,
-                'description': 'Detect devices with instance IDs outside valid BACnet range (0-4194303)',
-                'category': 'device-validation',
-                'single_check': True  # Returns issues for one type only
-            },
-            'device-address-conflicts': {
-                'function': check_device_address_conflicts,
-                'description': 'Detect devices with same address on same network/subnet',
-                'category': 'device-conflicts',
-                'single_check': True  # Returns issues for one type only
-            },
-            'missing-vendor-ids': {
-                'function': check_missing_vendor_ids,
-                'description': 'Detect devices without vendor identification or invalid vendor formats',
-                'category': 'device-validation',
-                'single_check': True  # Returns issues for one type only
-            },
-            'missing-properties': {
-                'function': check_missing_properties,
-                'description': 'Detect devices lacking essential BACnet properties',
-                'category': 'device-validation',
-                'single_check': True  # Returns issues for one type only
-            },
-            'unreachable-networks': {
-                'function': check_unreachable_networks,
-                'description': 'Detect networks isolated without routing paths to other networks',
-                'category': 'network-topology',
-                'single_check': True  # Returns issues for one type only
-            },
-            'missing-routers': {
-                'function': check_missing_routers,
-                'description': 'Detect multi-network setups without proper routing infrastructure',
-                'category': 'network-topology',
-                'single_check': True  # Returns issues for one type only
-            },
-            'network-loops': {
-                'function': check_network_loops,
-                'description': 'Detect circular routing dependencies that can cause broadcast storms',
-                'category': 'network-topology',
-                'single_check': True  # Returns issues for one type only
-            },
-            'subnet-mismatches': {
-                'function': check_subnet_mismatches,
-                'description': 'Detect devices with IP addresses outside their configured subnet ranges',
-                'category': 'network-topology',
-                'single_check': True  # Returns issues for one type only
-            },
-            'oversized-networks': {
-                'function': check_oversized_networks,
-                'description': 'Detect networks with too many devices that can impact performance',
-                'category': 'network-performance',
-                'single_check': False,  # Returns multiple types (warning and critical)
-                'related_types': ['oversized-networks-warning', 'oversized-networks-critical']
-            },
-            'oversized-networks-warning': {
-                'function': check_oversized_networks,
-                'description': 'Detect networks with moderately high device counts (performance warning)',
-                'category': 'network-performance',
-                'single_check': False,
-                'related_types': ['oversized-networks', 'oversized-networks-critical']
-            },
-            'oversized-networks-critical': {
-                'function': check_oversized_networks,
-                'description': 'Detect networks with critically high device counts (severe performance impact)',
-                'category': 'network-performance', 
-                'single_check': False,
-                'related_types': ['oversized-networks', 'oversized-networks-warning']
-            },
-            'duplicate-network': {
-                'function': check_duplicate_networks,
-                'description': 'Detect network numbers on routers in different subnets',
-                'category': 'network-topology', 
-                'single_check': False,  # Returns multiple types
-                'related_types': ['duplicate-router']  # Other types returned by same function
-            },
-            'duplicate-router': {
-                'function': check_duplicate_networks,
-                'description': 'Detect network numbers on multiple routers in same subnet',
-                'category': 'network-topology',
-                'single_check': False,
-                'related_types': ['duplicate-network']
-            },
-            'duplicate-bbmd-warning': {
-                'function': check_duplicate_bbmds,
-                'description': 'Detect multiple BBMDs on same subnet (not all have BDT entries)',
-                'category': 'bbmd-configuration',
-                'single_check': False,
-                'related_types': ['duplicate-bbmd-error']
-            },
-            'duplicate-bbmd-error': {
-                'function': check_duplicate_bbmds,  
-                'description': 'Detect multiple BBMDs with BDT entries on same subnet',
-                'category': 'bbmd-configuration',
-                'single_check': False,
-                'related_types': ['duplicate-bbmd-warning']
-            },
-            'broadcast-domain-warning': {
-                'function': check_broadcast_domains,
-                'description': 'Detect large broadcast domains that may impact performance',
-                'category': 'network-performance',
-                'single_check': False,
-                'related_types': ['broadcast-domain-critical', 'missing-bbmd-coverage', 'broadcast-domain-overlap']
-            },
-            'broadcast-domain-critical': {
-                'function': check_broadcast_domains,
-                'description': 'Detect critically large broadcast domains causing severe performance impact',
-                'category': 'network-performance',
-                'single_check': False,
-                'related_types': ['broadcast-domain-warning', 'missing-bbmd-coverage', 'broadcast-domain-overlap']
-            },
-            'missing-bbmd-coverage': {
-                'function': check_broadcast_domains,
-                'description': 'Detect complex broadcast domains lacking BBMD management',
-                'category': 'bbmd-configuration',
-                'single_check': False,
-                'related_types': ['broadcast-domain-warning', 'broadcast-domain-critical', 'broadcast-domain-overlap']
-            },
-            'broadcast-domain-overlap': {
-                'function': check_broadcast_domains,
-                'description': 'Detect overlapping broadcast domains that may cause conflicts',
-                'category': 'network-topology',
-                'single_check': False,
-                'related_types': ['broadcast-domain-warning', 'broadcast-domain-critical', 'missing-bbmd-coverage']
-            },
-            'routing-loop': {
-                'function': check_routing_inefficiencies,
-                'description': 'Detect routing loops that cause packet circulation and instability',
-                'category': 'routing-topology',
-                'single_check': False,
-                'related_types': ['suboptimal-routing-path', 'router-single-point-failure', 'asymmetric-routing', 'missing-redundancy']
-            },
-            'suboptimal-routing-path': {
-                'function': check_routing_inefficiencies,
-                'description': 'Detect inefficient routing paths with excessive hops',
-                'category': 'routing-performance',
-                'single_check': False,
-                'related_types': ['routing-loop', 'router-single-point-failure', 'asymmetric-routing', 'missing-redundancy']
-            },
-            'router-single-point-failure': {
-                'function': check_routing_inefficiencies,
-                'description': 'Detect routers that represent single points of failure',
-                'category': 'routing-reliability',
-                'single_check': False,
-                'related_types': ['routing-loop', 'suboptimal-routing-path', 'asymmetric-routing', 'missing-redundancy']
-            },
-            'asymmetric-routing': {
-                'function': check_routing_inefficiencies,
-                'description': 'Detect asymmetric routing configurations causing connectivity issues',
-                'category': 'routing-topology',
-                'single_check': False,
-                'related_types': ['routing-loop', 'suboptimal-routing-path', 'router-single-point-failure', 'missing-redundancy']
-            },
-            'missing-redundancy': {
-                'function': check_routing_inefficiencies,
-                'description': 'Detect networks lacking redundant routing paths',
-                'category': 'routing-reliability',
-                'single_check': False,
-                'related_types': ['routing-loop', 'suboptimal-routing-path', 'router-single-point-failure', 'asymmetric-routing']
-            }
+        self._checks: Dict[str, CheckMeta] = {
+            'duplicate-device-id': CheckMeta(
+                function_ref='duplicate_devices:check_duplicate_device_ids',
+                description='Detect devices with same ID across different networks/subnets',
+                category='device-conflicts',
+            ),
+            'orphaned-devices': CheckMeta(
+                function_ref='orphaned_devices:check_orphaned_devices',
+                description='Detect devices not connected to any network or subnet',
+                category='connectivity',
+            ),
+            'invalid-device-ranges': CheckMeta(
+                function_ref='invalid_device_ranges:check_invalid_device_ranges',
+                description='Detect devices with instance IDs outside valid BACnet range (0-4194303)',
+                category='device-validation',
+            ),
+            'device-address-conflicts': CheckMeta(
+                function_ref='device_address_conflicts:check_device_address_conflicts',
+                description='Detect devices with same address on same network/subnet',
+                category='device-conflicts',
+            ),
+            'missing-vendor-ids': CheckMeta(
+                function_ref='missing_vendor_ids:check_missing_vendor_ids',
+                description='Detect devices without vendor identification or invalid vendor formats',
+                category='device-validation',
+            ),
+            'missing-properties': CheckMeta(
+                function_ref='missing_properties:check_missing_properties',
+                description='Detect devices lacking essential BACnet properties',
+                category='device-validation',
+            ),
+            'unreachable-networks': CheckMeta(
+                function_ref='unreachable_networks:check_unreachable_networks',
+                description='Detect networks isolated without routing paths to other networks',
+                category='network-topology',
+            ),
+            'missing-routers': CheckMeta(
+                function_ref='missing_routers:check_missing_routers',
+                description='Detect multi-network setups without proper routing infrastructure',
+                category='network-topology',
+            ),
+            'network-loops': CheckMeta(
+                function_ref='network_loops:check_network_loops',
+                description='Detect circular routing dependencies that can cause broadcast storms',
+                category='network-topology',
+            ),
+            'subnet-mismatches': CheckMeta(
+                function_ref='subnet_mismatches:check_subnet_mismatches',
+                description='Detect devices with IP addresses outside their configured subnet ranges',
+                category='network-topology',
+            ),
+            'oversized-networks': CheckMeta(
+                function_ref='oversized_networks:check_oversized_networks',
+                description='Detect networks with too many devices that can impact performance',
+                category='network-performance',
+            ),
+            'oversized-networks-warning': CheckMeta(
+                function_ref='oversized_networks:check_oversized_networks',
+                description='Detect networks with moderately high device counts (performance warning)',
+                category='network-performance',
+            ),
+            'oversized-networks-critical': CheckMeta(
+                function_ref='oversized_networks:check_oversized_networks',
+                description='Detect networks with critically high device counts (severe performance impact)',
+                category='network-performance',
+            ),
+            'duplicate-network': CheckMeta(
+                function_ref='duplicate_networks:check_duplicate_networks',
+                description='Detect network numbers on routers in different subnets',
+                category='network-topology',
+            ),
+            'duplicate-router': CheckMeta(
+                function_ref='duplicate_networks:check_duplicate_networks',
+                description='Detect network numbers on multiple routers in same subnet',
+                category='network-topology',
+            ),
+            'duplicate-bbmd-warning': CheckMeta(
+                function_ref='duplicate_bbmds:check_duplicate_bbmds',
+                description='Detect multiple BBMDs on same subnet (not all have BDT entries)',
+                category='bbmd-configuration',
+            ),
+            'duplicate-bbmd-error': CheckMeta(
+                function_ref='duplicate_bbmds:check_duplicate_bbmds',
+                description='Detect multiple BBMDs with BDT entries on same subnet',
+                category='bbmd-configuration',
+            ),
+            'broadcast-domain-warning': CheckMeta(
+                function_ref='broadcast_domains:check_broadcast_domains',
+                description='Detect large broadcast domains that may impact performance',
+                category='network-performance',
+            ),
+            'broadcast-domain-critical': CheckMeta(
+                function_ref='broadcast_domains:check_broadcast_domains',
+                description='Detect critically large broadcast domains causing severe performance impact',
+                category='network-performance',
+            ),
+            'missing-bbmd-coverage': CheckMeta(
+                function_ref='broadcast_domains:check_broadcast_domains',
+                description='Detect complex broadcast domains lacking BBMD management',
+                category='bbmd-configuration',
+            ),
+            'broadcast-domain-overlap': CheckMeta(
+                function_ref='broadcast_domains:check_broadcast_domains',
+                description='Detect overlapping broadcast domains that may cause conflicts',
+                category='network-topology',
+            ),
+            'routing-loop': CheckMeta(
+                function_ref='routing_inefficiencies:check_routing_inefficiencies',
+                description='Detect routing loops that cause packet circulation and instability',
+                category='routing-topology',
+            ),
+            'suboptimal-routing-path': CheckMeta(
+                function_ref='routing_inefficiencies:check_routing_inefficiencies',
+                description='Detect inefficient routing paths with excessive hops',
+                category='routing-performance',
+            ),
+            'router-single-point-failure': CheckMeta(
+                function_ref='routing_inefficiencies:check_routing_inefficiencies',
+                description='Detect routers that represent single points of failure',
+                category='routing-reliability',
+            ),
+            'asymmetric-routing': CheckMeta(
+                function_ref='routing_inefficiencies:check_routing_inefficiencies',
+                description='Detect asymmetric routing configurations causing connectivity issues',
+                category='routing-topology',
+            ),
+            'missing-redundancy': CheckMeta(
+                function_ref='routing_inefficiencies:check_routing_inefficiencies',
+                description='Detect networks lacking redundant routing paths',
+                category='routing-reliability',
+            )
+        }
+        
+        # Lookups derived from the registry once, since it doesn't change after init
+        self._all_issue_types: Tuple[str, ...] = tuple(self._checks)
+        self._cli_choices: Tuple[str, ...] = self._all_issue_types + ('all',)
+        # Issue types grouped by the function that reports them, so each
+        # function can be dispatched once however many of its types are requested
+        fn_to_types: Dict[str, List[str]] = defaultdict(list)
+        types_by_category: Dict[str, List[str]] = defaultdict(list)
+        for issue_type, info in self._checks.items():
+            fn_to_types[info.function_ref].append(issue_type)
+            types_by_category[info.category].append(issue_type)
+        self._fn_to_types: Dict[str, Tuple[str, ...]] = {
+            function_ref: tuple(types) for function_ref, types in fn_to_types.items()
+        }
+        self._types_by_category: Dict[str, Tuple[str, ...]] = {
+            category: tuple(types) for category, types in types_by_category.items()
         }
+        # Each type resolves to itself followed by the other types its function reports
+        self._resolved: Dict[str, Tuple[str, ...]] = {
+            issue_type: (issue_type, *(
+                sibling for sibling in self._fn_to_types[info.function_ref] if sibling != issue_type
+            ))
+            for issue_type, info in self._checks.items()
+        }
+        self._resolved['all'] = self._all_issue_types
     
     def get_all_issue_types(self) -> List[str]:
         """Get list of all available issue types."""
-        return list(self._checks.keys())
+        return list(self._all_issue_types)
     
     def get_cli_choices(self) -> List[str]:
         """Get list of choices for CLI option, including 'all'."""
-        return self.get_all_issue_types() + ['all']
+        return list(self._cli_choices)
     
     def get_issue_description(self, issue_type: str) -> str:
         """Get description for an issue type."""
-        return self._checks.get(issue_type, {}).get('description', 'Unknown issue type')
+        info = self._checks.get(issue_type)
+        return info.description if info is not None else 'Unknown issue type'
     
     def resolve_issues_to_check(self, requested_issue: str) -> List[str]:
         """
@@ -229,21 +226,56 @@ class CheckRegistry:
         Returns:
             List of issue types to actually check
         """
-        if requested_issue == 'all':
-            return self.get_all_issue_types()
-        elif requested_issue in self._checks:
-            # For multi-type checks, we need to include related types
-            check_info = self._checks[requested_issue]
-            if check_info['single_check']:
-                return [requested_issue]
+        # 'all' resolves to every type; multi-type checks include their related types
+        return list(self._resolved.get(requested_issue, (requested_issue,)))
+    
+    def iter_execute_checks(self, issues_to_check: List[str], graph: Graph, verbose: bool = False) -> Iterator[Tuple[Dict[str, List[Dict[str, Any]]], List[Any], Iterable[str]]]:
+        """
+        Execute requested checks one function at a time, yielding each result.
+        
+        Each check function runs at most once. Multi-type functions yield the
+        issues for all of their related types together, since their affected
+        triples and nodes aren't attributed to a single type.
+        
+        Args:
+            issues_to_check: List of issue types to check for
+            graph: The RDF graph to analyze  
+            verbose: Whether to include verbose output
+            
+        Yields:
+            Tuple of (issues_by_type, affected_triples, affected_nodes) per check function
+        """
+        requested = set(issues_to_check)
+        
+        # Checks in this run share one device index, built on first use
+        with shared_device_index(graph):
+            yield from self._run_checks(requested, graph, verbose)
+    
+    def _run_checks(self, requested: Set[str], graph: Graph, verbose: bool) -> Iterator[Tuple[Dict[str, List[Dict[str, Any]]], List[Any], Iterable[str]]]:
+        """Run each check function with a requested type once, yielding its results."""
+        for function_ref, types in self._fn_to_types.items():
+            if requested.isdisjoint(types):
+                continue
+            
+            # Only the modules of checks that actually run get imported
+            issues, affected_triples, affected_nodes = _load_check(function_ref)(graph, verbose)
+            
+            if len(types) == 1:
+                # Single-type check - all issues belong to its one type
+                yield {types[0]: issues}, affected_triples, affected_nodes
             else:
-                # Include all related types for multi-type functions
-                related = check_info.get('related_types', [])
-                return [requested_issue] + related
-        else:
-            return [requested_issue]  # Let it fail downstream if invalid
+                # Multi-type check - separate issues by type in a single pass
+                issues_by_type = defaultdict(list)
+                for issue in issues:
+                    issues_by_type[issue.get('issue_type')].append(issue)
+                
+                yield (
+                    {issue_type: issues_by_type.get(issue_type, []) for issue_type in types},
+                    affected_triples,
+                    affected_nodes
+                )
     
-    def execute_checks(self, issues_to_check: List[str], graph: Graph, verbose: bool = False) -> Tuple[Dict[str, List[Dict[str, Any]]], List[rdflib.term.Node]]:
+    def execute_checks(self, issues_to_check: List[str], graph: Graph, verbose: bool = False) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Any], List[str]]:
         """
         Execute all requested checks, handling multi-type functions efficiently.
         
@@ -253,55 +285,29 @@ class CheckRegistry:
             verbose: Whether to include verbose output
             
         Returns:
-            Tuple of (all_issues_dict, all_affected_nodes)
+            Tuple of (all_issues_dict, all_affected_triples, all_affected_nodes)
         """
         all_issues: Dict[str, List[Dict[str, Any]]] = {}
-        all_affected_triples = []
-        all_affected_nodes = []
-        executed_functions = set()  # Track which functions we've already called
+        # Keyed by triple to drop repeats across checks, keeping first-seen order
+        all_affected_triples: Dict[Any, None] = {}
+        # Checks report nodes as URIRefs or plain strings; compare them as strings
+        all_affected_nodes: Set[str] = set()
         
-        for issue_type in issues_to_check:
-            if issue_type not in self._checks:
-                continue
-                
-            check_info = self._checks[issue_type]
-            function_id = id(check_info['function'])  # Unique function identifier
-            
-            if check_info['single_check']:
-                # Single-type check - execute directly
-                if function_id not in executed_functions:
-                    issues, affected_triples, affected_nodes = check_info['function'](graph, verbose)
-                    all_issues[issue_type] = issues
-                    all_affected_triples.extend(affected_triples)
-                    all_affected_nodes.extend(affected_nodes if isinstance(affected_nodes, list) else list(affected_nodes))
-                    executed_functions.add(function_id)
-            else:
-                # Multi-type check - execute once and separate results
-                if function_id not in executed_functions:
-                    issues, affected_triples, affected_nodes = check_info['function'](graph, verbose)
-                    
-                    # Separate issues by type for multi-type functions
-                    related_types = [issue_type] + check_info.get('related_types', [])
-                    for related_type in related_types:
-                        type_issues = [i for i in issues if i.get('issue_type') == related_type]
-                        all_issues[related_type] = type_issues
-                    
-                    all_affected_triples.extend(affected_triples)
-                    all_affected_nodes.extend(affected_nodes if isinstance(affected_nodes, list) else list(affected_nodes))
-                    executed_functions.add(function_id)
+        for issues_by_type, affected_triples, affected_nodes in self.iter_execute_checks(issues_to_check, graph, verbose):
+            all_issues.update(issues_by_type)
+            all_affected_triples.update(dict.fromkeys(affected_triples))
+            all_affected_nodes.update(map(str, affected_nodes))
         
-        return all_issues, all_affected_triples, list(set(all_affected_nodes))
+        return all_issues, list(all_affected_triples), list(all_affected_nodes)
     
     def get_issues_by_category(self, category: str) -> List[str]:
         """Get all issue types in a specific category."""
-        return [
-            issue_type for issue_type, info in self._checks.items()
-            if info.get('category') == category
-        ]
+        return list(self._types_by_category.get(category, ()))
     
     def is_single_check(self, issue_type: str) -> bool:
         """Check if an issue type returns only one type of issue."""
-        return self._checks.get(issue_type, {}).get('single_check', True)
+        info = self._checks.get(issue_type)
+        return info is None or len(self._fn_to_types[info.function_ref]) == 1
 
 
 # Global registry instance
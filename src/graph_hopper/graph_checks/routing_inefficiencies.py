@@ -5,9 +5,17 @@ Analyzes BACnet routing topology for performance issues and configuration proble
 Identifies routing loops, suboptimal paths, missing routers, and topology inefficiencies.
 """
 
-from typing import List, Set, Dict, Tuple, Any
-from rdflib import Graph, URIRef
+from functools import lru_cache
+from typing import List, Set, Dict, Tuple, Any, Optional
+from rdflib import Graph
 from collections import defaultdict, deque
+from .utils import BACNET_NS, RDF_TYPE
+
+
+_ROUTER_CLASS = BACNET_NS['Router']
+_NETWORK_CLASS = BACNET_NS['BACnetNetwork']
+_DEVICE_ON_NETWORK = BACNET_NS['device-on-network']
+_SERVES_NETWORK = BACNET_NS['serves-network']
 
 
 def check_routing_inefficiencies(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], Set[str]]:
@@ -32,21 +40,14 @@ def check_routing_inefficiencies(graph: Graph, verbose: bool = False) -> Tuple[L
     affected_nodes = set()
     affected_triples = []
     
-    # Build routing topology
-    bacnet_ns = URIRef("http://data.ashrae.org/bacnet/2020#")
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
-    
     # Find routers and networks
     routers = set()
     networks = set()
     
-    router_class = bacnet_ns + "Router"
-    network_class = bacnet_ns + "BACnetNetwork"
-    
-    for router, _, _ in graph.triples((None, rdf_type, router_class)):
+    for router, _, _ in graph.triples((None, RDF_TYPE, _ROUTER_CLASS)):
         routers.add(router)
     
-    for network, _, _ in graph.triples((None, rdf_type, network_class)):
+    for network, _, _ in graph.triples((None, RDF_TYPE, _NETWORK_CLASS)):
         networks.add(network)
     
     # Build routing graph
@@ -82,27 +83,26 @@ def _build_routing_graph(graph: Graph, routers: Set, networks: Set) -> Dict[str,
     Returns:
         Dictionary containing routing topology information
     """
-    bacnet_ns = URIRef("http://data.ashrae.org/bacnet/2020#")
-    device_on_network = bacnet_ns + "device-on-network"
-    serves_network = bacnet_ns + "serves-network"
-    
     # Router to networks mapping
     router_networks = defaultdict(set)  # Router -> {networks it's on}
     router_serves = defaultdict(set)    # Router -> {networks it serves}
     network_routers = defaultdict(set)  # Network -> {routers on it}
     
-    # Build router-network relationships
-    for router in routers:
-        # Networks the router is directly on
-        for _, _, network in graph.triples((router, device_on_network, None)):
-            if network in networks:
-                router_networks[str(router)].add(str(network))
-                network_routers[str(network)].add(str(router))
-        
-        # Networks the router serves (routes to)
-        for _, _, network in graph.triples((router, serves_network, None)):
-            if network in networks:
-                router_serves[str(router)].add(str(network))
+    # Build router-network relationships, scanning each predicate once
+    # rather than probing it per router
+    
+    # Networks each router is directly on
+    for router, network in graph.subject_objects(_DEVICE_ON_NETWORK):
+        if router in routers and network in networks:
+            router_str = str(router)
+            network_str = str(network)
+            router_networks[router_str].add(network_str)
+            network_routers[network_str].add(router_str)
+    
+    # Networks each router serves (routes to)
+    for router, network in graph.subject_objects(_SERVES_NETWORK):
+        if router in routers and network in networks:
+            router_serves[str(router)].add(str(network))
     
     # Build network connectivity graph
     network_connections = defaultdict(set)  # Network -> {connected networks}
@@ -133,32 +133,14 @@ def _check_routing_loops(routing_graph: Dict[str, Any], verbose: bool) -> List[D
     issues = []
     network_connections = routing_graph['network_connections']
     
-    # Use DFS to detect cycles in the network connectivity graph
-    visited = set()
-    rec_stack = set()
+    # Routing is symmetric, so the independent loops are the fundamental
+    # cycles of a BFS spanning forest: one per connection outside the forest
+    parent, depth, chords = _bfs_spanning_forest(network_connections, routing_graph['all_networks'])
     loops_found = []
-    
-    def dfs_cycle_detect(network: str, path: List[str]) -> None:
-        visited.add(network)
-        rec_stack.add(network)
-        path.append(network)
-        
-        for connected_network in network_connections.get(network, set()):
-            if connected_network not in visited:
-                dfs_cycle_detect(connected_network, path.copy())
-            elif connected_network in rec_stack:
-                # Found a cycle
-                cycle_start = path.index(connected_network)
-                cycle = path[cycle_start:] + [connected_network]
-                if len(cycle) > 2:  # Avoid trivial 2-node cycles
-                    loops_found.append(cycle)
-        
-        rec_stack.remove(network)
-    
-    # Check for cycles starting from each unvisited network
-    for network in routing_graph['all_networks']:
-        if network not in visited:
-            dfs_cycle_detect(network, [])
+    for start, end in chords:
+        cycle = _fundamental_cycle(parent, depth, start, end)
+        if len(cycle) > 2:  # A loop needs at least 3 networks
+            loops_found.append(cycle + [cycle[0]])
     
     # Process found loops
     processed_loops = set()
@@ -179,10 +161,12 @@ def _check_routing_loops(routing_graph: Dict[str, Any], verbose: bool) -> List[D
                 from_net = normalized_loop[i]
                 to_net = normalized_loop[i + 1]
                 
-                # Find routers that connect these networks
+                # Find routers that connect these networks, in either direction
+                # since the loop's orientation is arbitrary
                 for router_str, on_networks in routing_graph['routers'].items():
                     served_networks = routing_graph['router_serves'][router_str]
-                    if from_net in on_networks and to_net in served_networks:
+                    if ((from_net in on_networks and to_net in served_networks)
+                            or (to_net in on_networks and from_net in served_networks)):
                         loop_routers.add(router_str)
             
             severity = 'critical' if len(loop_networks) <= 4 else 'warning'
@@ -216,6 +200,62 @@ def _check_routing_loops(routing_graph: Dict[str, Any], verbose: bool) -> List[D
     return issues
 
 
+def _bfs_spanning_forest(network_connections: Dict[str, Set[str]], all_networks: Set[str]) -> Tuple[Dict[str, Optional[str]], Dict[str, int], List[Tuple[str, str]]]:
+    """
+    Build a BFS spanning forest over the network connections.
+    
+    Returns:
+        Tuple of (parent, depth, chords) where chords are the connections
+        outside the forest, each listed once
+    """
+    parent: Dict[str, Optional[str]] = {}
+    depth: Dict[str, int] = {}
+    order: Dict[str, int] = {}  # BFS visit order, used to list each chord once
+    chords = []
+    
+    for root in all_networks:
+        if root in parent:
+            continue
+        
+        parent[root] = None
+        depth[root] = 0
+        order[root] = len(order)
+        queue = deque([root])
+        
+        while queue:
+            current = queue.popleft()
+            for neighbor in network_connections.get(current, set()):
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    depth[neighbor] = depth[current] + 1
+                    order[neighbor] = len(order)
+                    queue.append(neighbor)
+                elif neighbor != parent[current] and parent[neighbor] != current and order[current] < order[neighbor]:
+                    chords.append((current, neighbor))
+    
+    return parent, depth, chords
+
+
+def _fundamental_cycle(parent: Dict[str, Optional[str]], depth: Dict[str, int], start: str, end: str) -> List[str]:
+    """Return the loop a chord closes: start up to the common ancestor and back down to end."""
+    up, down = [start], [end]
+    a, b = start, end
+    while depth[a] > depth[b]:
+        a = parent[a]
+        up.append(a)
+    while depth[b] > depth[a]:
+        b = parent[b]
+        down.append(b)
+    while a != b:
+        a, b = parent[a], parent[b]
+        up.append(a)
+        down.append(b)
+    # Both walks end at the common ancestor; keep it once
+    down.pop()
+    down.reverse()
+    return up + down
+
+
 def _check_suboptimal_paths(routing_graph: Dict[str, Any], verbose: bool) -> List[Dict[str, Any]]:
     """Check for suboptimal routing paths between networks."""
     issues = []
@@ -224,9 +264,10 @@ def _check_suboptimal_paths(routing_graph: Dict[str, Any], verbose: bool) -> Lis
     
     # For each pair of networks, find shortest path and check for inefficiencies
     for source in all_networks:
-        # Use BFS to find shortest paths from this source
+        # Use BFS to find shortest path distances from this source, keeping
+        # only each network's predecessor rather than its full path
         distances = {source: 0}
-        paths = {source: [source]}
+        predecessors = {}
         queue = deque([source])
         
         while queue:
@@ -236,13 +277,13 @@ def _check_suboptimal_paths(routing_graph: Dict[str, Any], verbose: bool) -> Lis
             for neighbor in network_connections.get(current, set()):
                 if neighbor not in distances:
                     distances[neighbor] = current_distance + 1
-                    paths[neighbor] = paths[current] + [neighbor]
+                    predecessors[neighbor] = current
                     queue.append(neighbor)
         
         # Check for paths that seem unnecessarily long
         for target, distance in distances.items():
             if distance > 4:  # Paths longer than 4 hops are potentially inefficient
-                path = paths[target]
+                path = _reconstruct_path(predecessors, source, target)
                 
                 # Check if there might be a more direct connection missing
                 issue = {
@@ -274,6 +315,15 @@ def _check_suboptimal_paths(routing_graph: Dict[str, Any], verbose: bool) -> Lis
     return issues
 
 
+def _reconstruct_path(predecessors: Dict[str, str], source: str, target: str) -> List[str]:
+    """Rebuild the BFS path from source to target by walking predecessors back."""
+    path = [target]
+    while path[-1] != source:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
 def _check_router_isolation(routing_graph: Dict[str, Any], verbose: bool) -> List[Dict[str, Any]]:
     """Check for routers that represent single points of failure."""
     issues = []
@@ -322,15 +372,22 @@ def _check_asymmetric_routing(routing_graph: Dict[str, Any], verbose: bool) -> L
     issues = []
     network_connections = routing_graph['network_connections']
     
-    # Check for asymmetric connections (A -> B but not B -> A)
+    # Check for asymmetric connections (A -> B but not B -> A). Invert the
+    # adjacency once so each network's one-way links are a set difference
+    reverse_connections = defaultdict(set)
+    for network_a, connected_networks in network_connections.items():
+        for network_b in connected_networks:
+            reverse_connections[network_b].add(network_a)
+    
     asymmetric_pairs = []
     
     for network_a, connected_networks in network_connections.items():
-        for network_b in connected_networks:
-            # Check if the reverse connection exists
-            reverse_connections = network_connections.get(network_b, set())
-            if network_a not in reverse_connections:
-                asymmetric_pairs.append((network_a, network_b))
+        one_way = connected_networks - reverse_connections.get(network_a, set())
+        if one_way:
+            # Keep the adjacency's ordering for the reported pairs
+            asymmetric_pairs.extend(
+                (network_a, network_b) for network_b in connected_networks if network_b in one_way
+            )
     
     for network_a, network_b in asymmetric_pairs:
         issue = {
@@ -369,42 +426,52 @@ def _check_missing_redundancy(routing_graph: Dict[str, Any], verbose: bool) -> L
     
     # Find articulation points (networks whose removal would disconnect the graph)
     def find_articulation_points():
-        visited = set()
         disc = {}
         low = {}
         parent = {}
+        children = {}
         articulation_points = set()
-        time = [0]  # Use list to modify in nested function
+        time = 0
         
-        def bridge_util(u):
-            children = 0
-            visited.add(u)
-            disc[u] = low[u] = time[0]
-            time[0] += 1
+        for root in all_networks:
+            if root in disc:
+                continue
             
-            for v in network_connections.get(u, set()):
-                if v not in visited:
-                    children += 1
-                    parent[v] = u
-                    bridge_util(v)
-                    
+            disc[root] = low[root] = time
+            time += 1
+            children[root] = 0
+            # Iterative Tarjan: each stack entry is a network and its unexplored neighbours
+            stack = [(root, iter(network_connections.get(root, set())))]
+            
+            while stack:
+                u, neighbours = stack[-1]
+                for v in neighbours:
+                    if v not in disc:
+                        children[u] += 1
+                        parent[v] = u
+                        disc[v] = low[v] = time
+                        time += 1
+                        children[v] = 0
+                        stack.append((v, iter(network_connections.get(v, set()))))
+                        break
+                    elif v != parent.get(u):
+                        low[u] = min(low[u], disc[v])
+                else:
+                    # u is finished; fold its low value into its DFS parent
+                    stack.pop()
+                    if not stack:
+                        continue
+                    v, u = u, stack[-1][0]
                     low[u] = min(low[u], low[v])
                     
                     # u is an articulation point in following cases:
                     # 1. u is root and has more than one child
-                    if parent.get(u) is None and children > 1:
+                    if parent.get(u) is None and children[u] > 1:
                         articulation_points.add(u)
                     
                     # 2. u is not root and low[v] >= disc[u]
                     if parent.get(u) is not None and low[v] >= disc[u]:
                         articulation_points.add(u)
-                
-                elif v != parent.get(u):
-                    low[u] = min(low[u], disc[v])
-        
-        for network in all_networks:
-            if network not in visited:
-                bridge_util(network)
         
         return articulation_points
     
@@ -441,18 +508,16 @@ def _check_missing_redundancy(routing_graph: Dict[str, Any], verbose: bool) -> L
     return issues
 
 
+@lru_cache(maxsize=4096)
 def _get_network_name_from_uri(network_uri: str) -> str:
     """Extract a readable name from network URI."""
-    if '/' in network_uri:
-        return network_uri.split('/')[-1]
-    return network_uri
+    return network_uri.rpartition('/')[2]
 
 
+@lru_cache(maxsize=4096)
 def _get_router_name_from_uri(router_uri: str) -> str:
     """Extract a readable name from router URI."""
-    if '/' in router_uri:
-        return router_uri.split('/')[-1]
-    return router_uri
+    return router_uri.rpartition('/')[2]
 
 
 def _get_loop_performance_impact(loop_length: int, severity: str) -> str:
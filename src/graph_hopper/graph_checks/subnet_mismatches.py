@@ -9,11 +9,18 @@ This check validates that device IP addresses fall within the subnet ranges they
 assigned to, ensuring proper network topology consistency.
 """
 
-from typing import List, Tuple, Any, Dict
+from typing import List, Tuple, Any, Dict, Optional, Union
 import ipaddress
-from rdflib import Graph, URIRef
+from rdflib import Graph
 import rdflib.term
-from .utils import BACNET_NS
+from .utils import BACNET_NS, RDF_TYPE, RDFS_LABEL, DeviceRecord, build_device_index
+
+
+_SUBNET_CLASS = BACNET_NS['Subnet']
+_SUBNET_ADDRESS = BACNET_NS['subnet-address']
+_SUBNET_OF_NETWORK = BACNET_NS['subnet-of-network']
+_ADDRESS = BACNET_NS['address']
+_DEVICE_INSTANCE = BACNET_NS['device-instance']
 
 
 def check_subnet_mismatches(graph: Graph, verbose: bool = False) -> Tuple[List[Dict[str, Any]], List[rdflib.term.Node]]:
@@ -31,68 +38,57 @@ def check_subnet_mismatches(graph: Graph, verbose: bool = False) -> Tuple[List[D
     affected_nodes = []
     affected_triples = []
     
-    device_type = BACNET_NS['Device']
-    subnet_type = BACNET_NS['Subnet']
-    rdf_type = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
-    
     # Build subnet information mapping
     subnet_info = {}
-    for subnet, _, _ in graph.triples((None, rdf_type, subnet_type)):
+    for subnet, _, _ in graph.triples((None, RDF_TYPE, _SUBNET_CLASS)):
         subnet_address = None
         subnet_label = str(subnet)
         
         # Get subnet address/CIDR
-        for _, _, addr in graph.triples((subnet, BACNET_NS['subnet-address'], None)):
+        for _, _, addr in graph.triples((subnet, _SUBNET_ADDRESS, None)):
             subnet_address = str(addr)
         
         # Get subnet label for better reporting
-        for _, _, label in graph.triples((subnet, URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
+        for _, _, label in graph.triples((subnet, RDFS_LABEL, None)):
             subnet_label = str(label)
         
         if subnet_address:
             subnet_info[subnet] = {
                 'address': subnet_address,
+                'network_obj': _parse_subnet(subnet_address),  # Parsed once per subnet
                 'label': subnet_label,
                 'network': None
             }
             
             # Find which network this subnet belongs to
-            for _, _, network in graph.triples((subnet, BACNET_NS['subnet-of-network'], None)):
+            for _, _, network in graph.triples((subnet, _SUBNET_OF_NETWORK, None)):
                 subnet_info[subnet]['network'] = network
     
-    # Check each device's IP address against its subnet
-    for device, _, _ in graph.triples((None, rdf_type, device_type)):
-        device_address = None
-        device_label = str(device)
-        device_instance = None
-        device_subnet = None
+    # Check each device's IP address against its subnet, reading device
+    # properties from the shared index rather than probing the graph per device.
+    # A device with several values for a property is checked with the last one
+    for record in build_device_index(graph).devices.values():
+        device = record.node
+        device_address = _last_value(record, _ADDRESS)
+        device_subnet = record.on_subnets[-1] if record.on_subnets else None
         
-        # Get device information
-        for _, _, addr in graph.triples((device, BACNET_NS['address'], None)):
-            device_address = str(addr)
-            
-        for _, _, label in graph.triples((device, URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
-            device_label = str(label)
-            
-        for _, _, instance in graph.triples((device, BACNET_NS['device-instance'], None)):
-            device_instance = str(instance)
-            
-        for _, _, subnet in graph.triples((device, BACNET_NS['device-on-subnet'], None)):
-            device_subnet = subnet
-            
         # Only check devices that have both address and subnet assignment
-        if device_address and device_subnet and device_subnet in subnet_info:
+        if device_address and device_subnet in subnet_info:
+            device_label = _last_value(record, RDFS_LABEL)
+            if device_label is None:
+                device_label = record.uri
+            device_instance = _last_value(record, _DEVICE_INSTANCE)
             subnet_data = subnet_info[device_subnet]
             
             # Check if device IP is within subnet range
-            if not _is_ip_in_subnet(device_address, subnet_data['address']):
+            if not _is_ip_in_subnet(device_address, subnet_data['network_obj']):
                 issue = {
                     'issue_type': 'subnet-mismatches',
                     'severity': 'medium',
                     'message': f'Device IP address {device_address} does not match subnet {subnet_data["address"]}',
                     'description': ('Device IP address is outside the range of its assigned subnet. '
                                   'This can cause routing issues and communication failures.'),
-                    'device': str(device),
+                    'device': record.uri,
                     'device_label': device_label,
                     'device_instance': device_instance,
                     'device_address': device_address,
@@ -104,9 +100,9 @@ def check_subnet_mismatches(graph: Graph, verbose: bool = False) -> Tuple[List[D
                 if verbose:
                     network_label = "Unknown"
                     if subnet_data['network']:
-                        for _, _, label in graph.triples((subnet_data['network'], URIRef("http://www.w3.org/2000/01/rdf-schema#label"), None)):
+                        label = graph.value(subnet_data['network'], RDFS_LABEL)
+                        if label is not None:
                             network_label = str(label)
-                            break
                         if network_label == "Unknown":
                             network_label = str(subnet_data['network'])
                     
@@ -121,28 +117,81 @@ def check_subnet_mismatches(graph: Graph, verbose: bool = False) -> Tuple[List[D
     return issues, affected_triples, affected_nodes
 
 
-def _is_ip_in_subnet(ip_address: str, subnet_cidr: str) -> bool:
+def _last_value(record: DeviceRecord, predicate: rdflib.term.Node) -> Optional[str]:
+    """Return the last value a device has for a property, as a string."""
+    values = record.properties.get(predicate)
+    return str(values[-1]) if values else None
+
+
+def _parse_subnet(subnet_cidr: str) -> Optional[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
     """
-    Check if an IP address falls within a subnet CIDR range.
+    Parse a subnet CIDR once so it can be reused for every device on the subnet.
     
     Args:
-        ip_address: IP address to check (e.g., "192.168.1.100")
         subnet_cidr: Subnet in CIDR notation (e.g., "192.168.1.0/24")
     
+    Returns:
+        The parsed network, or None if the subnet can't be parsed
+    """
+    try:
+        return ipaddress.ip_network(subnet_cidr, strict=False)
+    except ValueError:
+        return None
+
+
+def _parse_ipv4(ip_address: str) -> Optional[int]:
+    """
+    Convert a strict dotted-quad IPv4 address to an integer.
+    
+    Accepts the same forms as ipaddress (four decimal octets, no leading
+    zeros), so anything else falls back to ipaddress parsing.
+    
+    Returns:
+        The address as an integer, or None if it isn't a plain dotted quad
+    """
+    parts = ip_address.split('.')
+    if len(parts) != 4:
+        return None
+    
+    value = 0
+    for part in parts:
+        if not (part.isascii() and part.isdigit()) or len(part) > 3 or (len(part) > 1 and part[0] == '0'):
+            return None
+        octet = int(part)
+        if octet > 255:
+            return None
+        value = (value << 8) | octet
+    return value
+
+
+def _is_ip_in_subnet(ip_address: str, network: Optional[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]) -> bool:
+    """
+    Check if an IP address falls within a parsed subnet.
+    
+    Args:
+        ip_address: IP address to check (e.g., "192.168.1.100")
+        network: Subnet parsed by _parse_subnet, or None if it couldn't be parsed
+    
     Returns:
         True if IP is in subnet, False otherwise
     """
+    if network is None:
+        # If we can't parse the subnet, skip validation
+        return True
+    
+    # Plain dotted-quad IPv4 is compared as integers, without building address objects
+    if network.version == 4:
+        ip_int = _parse_ipv4(ip_address)
+        if ip_int is not None:
+            return ip_int & int(network.netmask) == int(network.network_address)
+    
     try:
         # Parse the IP address
         ip = ipaddress.ip_address(ip_address)
-        
-        # Parse the subnet
-        network = ipaddress.ip_network(subnet_cidr, strict=False)
-        
-        # Check if IP is in network
-        return ip in network
-        
-    except (ipaddress.AddressValueError, ValueError):
-        # If we can't parse the IP or subnet, skip validation
+    except ValueError:
+        # If we can't parse the IP, skip validation
         # This handles BACnet addresses, malformed IPs, etc.
         return True
+    
+    # Check if IP is in network
+    return ip in network
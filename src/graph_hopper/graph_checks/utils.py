@@ -1,15 +1,168 @@
 """
 Common utilities for graph checking modules.
+
+The checks probe the graph with (s, p, None) and (None, p, o) patterns and
+expect a store with subject- and predicate-keyed indexes. rdflib's default
+Memory store, which every command here loads into, provides them; callers
+passing graphs backed by another store should make sure it does too.
 """
 
 import json
-from typing import List, Dict, Any
-from rdflib import Namespace
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterator, Optional, Set
+from rdflib import Graph, Namespace, URIRef
+import rdflib.term
 
 
 # BACnet namespace from the real data
 BACNET_NS = Namespace("http://data.ashrae.org/bacnet/2020#")
 
+RDF_TYPE = URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
+RDFS_LABEL = URIRef("http://www.w3.org/2000/01/rdf-schema#label")
+
+_DEVICE = BACNET_NS['Device']
+_DEVICE_INSTANCE = BACNET_NS['device-instance']
+_ADDRESS = BACNET_NS['address']
+_VENDOR_ID = BACNET_NS['vendor-id']
+_DEVICE_ON_NETWORK = BACNET_NS['device-on-network']
+_DEVICE_ON_SUBNET = BACNET_NS['device-on-subnet']
+
+
+@dataclass(slots=True)
+class DeviceRecord:
+    """Properties of a single ns1:Device, gathered once per index build.
+    
+    The string fields are converted from their rdflib terms once here so
+    checks never repeat the conversion per lookup.
+    """
+    node: rdflib.term.Node
+    properties: Dict[rdflib.term.Node, List[rdflib.term.Node]]
+    uri: str = ''
+    label: Optional[str] = None
+    instance: Optional[str] = None
+    address: Optional[str] = None
+    vendor_id: Optional[str] = None
+    on_networks: List[rdflib.term.Node] = field(default_factory=list)
+    on_subnets: List[rdflib.term.Node] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DeviceIndex:
+    """Per-device properties shared by the device checks."""
+    devices: Dict[rdflib.term.Node, DeviceRecord]
+    # Grasshopper's own nodes (matched on URI or label), which device checks skip
+    grasshopper_devices: Set[rdflib.term.Node] = field(default_factory=set)
+
+
+# Indexes shared for the duration of a shared_device_index() block, keyed
+# by graph identity. Entries hold the graph itself so ids can't be reused
+_SHARED_DEVICE_INDEXES: Dict[int, List[Any]] = {}
+
+
+@contextmanager
+def shared_device_index(graph: Graph) -> Iterator[None]:
+    """
+    Share one device index for a graph across every check run inside the block.
+    
+    The index is built on first use and dropped when the block exits, so
+    checks run together pay for the device lookups once, while later runs always
+    see the graph's current contents. The graph must not be modified inside
+    the block.
+    
+    Args:
+        graph: The RDF graph the checks will run against
+    """
+    key = id(graph)
+    if key in _SHARED_DEVICE_INDEXES:
+        # Nested block for the same graph: the outer block owns the entry
+        yield
+        return
+    
+    _SHARED_DEVICE_INDEXES[key] = [graph, None]
+    try:
+        yield
+    finally:
+        del _SHARED_DEVICE_INDEXES[key]
+
+
+def build_device_index(graph: Graph) -> DeviceIndex:
+    """
+    Build the device index for a graph.
+    
+    Devices come from the rdf:type index and their properties from one
+    subject lookup per device, so the cost follows the devices' own triples
+    rather than the size of the graph. Inside a shared_device_index() block
+    the index is built once and reused by every check; outside one, each
+    call builds a fresh index.
+    
+    Args:
+        graph: The RDF graph to index
+        
+    Returns:
+        DeviceIndex for the graph
+    """
+    shared = _SHARED_DEVICE_INDEXES.get(id(graph))
+    if shared is not None and shared[0] is graph:
+        if shared[1] is None:
+            shared[1] = _index_devices(graph)
+        return shared[1]
+    return _index_devices(graph)
+
+
+def _index_devices(graph: Graph) -> DeviceIndex:
+    """Look up every device's properties and build a DeviceIndex."""
+    devices = {}
+    for device in graph.subjects(RDF_TYPE, _DEVICE):
+        properties = {}
+        for predicate, obj in graph.predicate_objects(device):
+            properties.setdefault(predicate, []).append(obj)
+        devices[device] = DeviceRecord(node=device, properties=properties)
+    
+    def first(properties, predicate):
+        values = properties.get(predicate)
+        return str(values[0]) if values else None
+    
+    grasshopper_devices = set()
+    for record in devices.values():
+        properties = record.properties
+        record.uri = str(record.node)
+        record.label = first(properties, RDFS_LABEL)
+        record.instance = first(properties, _DEVICE_INSTANCE)
+        record.address = first(properties, _ADDRESS)
+        record.vendor_id = first(properties, _VENDOR_ID)
+        record.on_networks = properties.get(_DEVICE_ON_NETWORK, [])
+        record.on_subnets = properties.get(_DEVICE_ON_SUBNET, [])
+        if "Grasshopper" in record.uri or (record.label and "Grasshopper" in record.label):
+            grasshopper_devices.add(record.node)
+    
+    index = DeviceIndex(
+        devices=devices,
+        grasshopper_devices=grasshopper_devices
+    )
+    return index
+
+
+def index_predicate(graph: Graph, predicate: rdflib.term.Node) -> Dict[rdflib.term.Node, List[rdflib.term.Node]]:
+    """
+    Index all objects of a predicate by subject in a single store scan.
+    
+    Lets checks replace per-subject ``graph.triples((s, predicate, None))``
+    probes inside their loops with a dict lookup.
+    
+    Args:
+        graph: The RDF graph to index
+        predicate: Predicate whose triples should be indexed
+        
+    Returns:
+        Dict mapping each subject to the list of its objects for the predicate
+    """
+    index = defaultdict(list)
+    for subject, _, obj in graph.triples((None, predicate, None)):
+        index[subject].append(obj)
+    return dict(index)
+
 
 def format_human_readable(issues: List[Dict[str, Any]], issue_type: str, verbose: bool = False) -> str:
     """Format issues in human-readable format."""
@@ -0,0 +1,64 @@
+"""
+Tests for the shared device index used by the device checks.
+"""
+
+from rdflib import Graph, URIRef, Literal
+from graph_hopper.graph_checks.missing_vendor_ids import check_missing_vendor_ids
+from graph_hopper.graph_checks.utils import BACNET_NS, RDF_TYPE, RDFS_LABEL, build_device_index, shared_device_index
+
+
+def _device_graph():
+    graph = Graph()
+    device = URIRef("bacnet://device/1234")
+    graph.add((device, RDF_TYPE, BACNET_NS['Device']))
+    graph.add((device, RDFS_LABEL, Literal("Test Device")))
+    graph.add((device, BACNET_NS['device-instance'], Literal("1234")))
+    graph.add((device, BACNET_NS['address'], Literal("192.168.1.100")))
+    graph.add((device, BACNET_NS['device-on-network'], URIRef("bacnet://network/1")))
+    graph.add((URIRef("bacnet://router/1"), RDF_TYPE, BACNET_NS['Router']))
+    return graph, device
+
+
+def test_device_index_collects_device_fields():
+    """Test that device records expose the commonly used properties."""
+    graph, device = _device_graph()
+    
+    index = build_device_index(graph)
+    
+    assert list(index.devices) == [device]
+    record = index.devices[device]
+    assert record.label == "Test Device"
+    assert record.instance == "1234"
+    assert record.address == "192.168.1.100"
+    assert record.vendor_id is None
+    assert record.on_networks == [URIRef("bacnet://network/1")]
+    assert record.on_subnets == []
+    # Only devices are indexed
+    assert URIRef("bacnet://router/1") not in index.devices
+
+
+def test_device_index_is_shared_within_a_check_run():
+    """Test that the index is built once inside a shared block and not reused after it."""
+    graph, device = _device_graph()
+    
+    with shared_device_index(graph):
+        index = build_device_index(graph)
+        assert build_device_index(graph) is index
+    
+    assert build_device_index(graph) is not index
+
+
+def test_device_index_sees_same_size_modifications():
+    """Test that replacing a value, which keeps the triple count, is picked up."""
+    graph, device = _device_graph()
+    graph.add((device, BACNET_NS['vendor-id'], Literal("bacnet://vendor/5")))
+    
+    issues, _, _ = check_missing_vendor_ids(graph)
+    assert issues == []
+    assert build_device_index(graph).devices[device].vendor_id == "bacnet://vendor/5"
+    
+    graph.set((device, BACNET_NS['vendor-id'], Literal("garbage")))
+    
+    assert build_device_index(graph).devices[device].vendor_id == "garbage"
+    issues, _, _ = check_missing_vendor_ids(graph)
+    assert len(issues) == 1
@@ -0,0 +1,81 @@
+"""
+Tests for Duplicate Networks Check
+
+Tests the classification of a network number shared by several routers.
+"""
+
+from rdflib import Graph
+from graph_hopper.graph_checks.duplicate_networks import check_duplicate_networks
+
+
+PREFIXES = """
+@prefix ns1: <http://data.ashrae.org/bacnet/2020#> .
+"""
+
+
+def _parse(ttl_data):
+    graph = Graph()
+    graph.parse(data=PREFIXES + ttl_data, format='turtle')
+    return graph
+
+
+def test_empty_graph():
+    """Test empty graph returns no issues."""
+    issues, affected_triples, affected_nodes = check_duplicate_networks(Graph())
+    assert len(issues) == 0
+    assert len(affected_nodes) == 0
+
+
+def test_routers_on_same_subnet():
+    """Test routers sharing a network number on one subnet are a duplicate router."""
+    graph = _parse("""
+    <bacnet://router/1> a ns1:Router ;
+        ns1:device-on-network <bacnet://network/100> ;
+        ns1:device-on-subnet <bacnet://subnet/10.0.0.0-24> .
+
+    <bacnet://router/2> a ns1:Router ;
+        ns1:device-on-network <bacnet://network/100> ;
+        ns1:device-on-subnet <bacnet://subnet/10.0.0.0-24> .
+    """)
+
+    issues, affected_triples, affected_nodes = check_duplicate_networks(graph)
+
+    assert len(issues) == 1
+    assert issues[0]['issue_type'] == 'duplicate-router'
+    assert issues[0]['subnets'] == ['bacnet://subnet/10.0.0.0-24']
+
+
+def test_routers_on_different_subnets():
+    """Test routers sharing a network number across subnets are a duplicate network."""
+    graph = _parse("""
+    <bacnet://router/1> a ns1:Router ;
+        ns1:device-on-network <bacnet://network/100> ;
+        ns1:device-on-subnet <bacnet://subnet/10.0.0.0-24> .
+
+    <bacnet://router/2> a ns1:Router ;
+        ns1:device-on-network <bacnet://network/100> ;
+        ns1:device-on-subnet <bacnet://subnet/10.0.1.0-24> .
+    """)
+
+    issues, affected_triples, affected_nodes = check_duplicate_networks(graph)
+
+    assert len(issues) == 1
+    assert issues[0]['issue_type'] == 'duplicate-network'
+    assert sorted(issues[0]['subnets']) == ['bacnet://subnet/10.0.0.0-24', 'bacnet://subnet/10.0.1.0-24']
+
+
+def test_router_without_subnet_uses_known_subnet():
+    """Test a router with no subnet data doesn't turn a duplicate router into a duplicate network."""
+    graph = _parse("""
+    <bacnet://router/1> a ns1:Router ;
+        ns1:device-on-network <bacnet://network/100> ;
+        ns1:device-on-subnet <bacnet://subnet/10.0.0.0-24> .
+
+    <bacnet://router/2> a ns1:Router ;
+        ns1:device-on-network <bacnet://network/100> .
+    """)
+
+    issues, affected_triples, affected_nodes = check_duplicate_networks(graph)
+
+    assert len(issues) == 1
+    assert issues[0]['issue_type'] == 'duplicate-router'
@@ -373,3 +373,38 @@ def test_uri_format_vendor_ids():
     assert 'invalid vendor-id format' in issue['description']
     
     assert len(affected_nodes) == 1
+
+
+def test_vendor_id_formats_accepted_by_int():
+    """Test vendor IDs parse like int(), taking the last segment of URI format IDs."""
+    ttl_content = """
+    @prefix ex: <http://example.org/> .
+    @prefix bacnet: <http://data.ashrae.org/bacnet/2020#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+    ex:Device1 a bacnet:Device ;
+        rdfs:label "Device One" ;
+        bacnet:vendor-id "1_000" .
+
+    ex:Device2 a bacnet:Device ;
+        rdfs:label "Device Two" ;
+        bacnet:vendor-id "bacnet://vendor/x/123" .
+
+    ex:Device3 a bacnet:Device ;
+        rdfs:label "Device Three" ;
+        bacnet:vendor-id " 42 " .
+
+    ex:Device4 a bacnet:Device ;
+        rdfs:label "Device Four" ;
+        bacnet:vendor-id "http://example.org/vendor/123" .
+    """
+    
+    graph = Graph()
+    graph.parse(data=ttl_content, format="turtle")
+    
+    issues, affected_triples, affected_nodes = check_missing_vendor_ids(graph)
+    
+    # Only the URI that isn't in bacnet://vendor/N format is rejected
+    assert len(issues) == 1
+    assert 'Device Four' in issues[0]['description']
+    assert 'invalid vendor-id format' in issues[0]['description']
@@ -260,3 +260,24 @@ def test_router_information_in_output():
     router_uris = [r['router_uri'] for r in routers_info]
     assert 'bacnet://router/1001' in router_uris
     assert 'bacnet://router/1002' in router_uris
+
+
+def test_detects_large_ring_loop():
+    """Test that loops longer than a handful of networks are still detected."""
+    ring_size = 12
+    lines = ["@prefix ns1: <http://data.ashrae.org/bacnet/2020#> ."]
+    for i in range(ring_size):
+        lines.append(
+            f"<bacnet://router/{i}> a ns1:Router ; "
+            f"ns1:device-on-network <bacnet://network/{i}> ; "
+            f"ns1:serves-network <bacnet://network/{(i + 1) % ring_size}> ."
+        )
+    
+    graph = Graph()
+    graph.parse(data="\n".join(lines), format='turtle')
+    
+    issues, affected_triples, affected_nodes = check_network_loops(graph)
+    
+    assert len(issues) == 1
+    assert issues[0]['loop_size'] == ring_size
+    assert len(issues[0]['details']['routers_causing_loop']) == ring_size
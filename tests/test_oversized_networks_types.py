@@ -84,6 +84,64 @@ def test_ip_network_type_detection():
     assert 'vlan' in recommendation.lower() or 'subnet' in recommendation.lower()
 
 
+def test_ip_port_addresses_detect_ip_network():
+    """Test that IP:port device addresses identify an IP network when nothing else does."""
+    devices = []
+    for i in range(1, 61):  # 60 devices
+        devices.append(f"""
+    <http://example.com/device/d{i}> a ns1:Device ;
+        ns1:device-instance {2000+i} ;
+        ns1:address "10.0.0.{i}:47808" ;
+        ns1:device-on-network <http://example.com/network/bldg> .""")
+
+    ttl_data = f"""
+    @prefix ns1: <http://data.ashrae.org/bacnet/2020#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+    <http://example.com/network/bldg> a ns1:BACnetNetwork ;
+        rdfs:label "Building Network" .
+    {"".join(devices)}
+    """
+
+    graph = Graph()
+    graph.parse(data=ttl_data, format='turtle')
+
+    issues, affected_triples, affected_nodes = check_oversized_networks(graph)
+
+    assert len(issues) == 1
+    assert issues[0]['network_type'] == 'ip'
+    assert issues[0]['issue_type'] == 'oversized-networks-warning'
+
+
+def test_out_of_range_octets_do_not_detect_ip_network():
+    """Test that dotted addresses with an octet above 255 are not counted as IP."""
+    devices = []
+    for i in range(1, 61):  # 60 devices
+        devices.append(f"""
+    <http://example.com/device/d{i}> a ns1:Device ;
+        ns1:device-instance {2000+i} ;
+        ns1:address "300.1.1.{i}" ;
+        ns1:device-on-network <http://example.com/network/bldg> .""")
+
+    ttl_data = f"""
+    @prefix ns1: <http://data.ashrae.org/bacnet/2020#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+    <http://example.com/network/bldg> a ns1:BACnetNetwork ;
+        rdfs:label "Building Network" .
+    {"".join(devices)}
+    """
+
+    graph = Graph()
+    graph.parse(data=ttl_data, format='turtle')
+
+    issues, affected_triples, affected_nodes = check_oversized_networks(graph)
+
+    assert len(issues) == 1
+    assert issues[0]['network_type'] == 'other'
+    assert issues[0]['issue_type'] == 'oversized-networks-critical'
+
+
 def test_network_type_comparison():
     """Test that MSTP and IP networks have different thresholds for same device count."""
     # Create identical device count (25 devices) on both MSTP and IP networks
@@ -2,7 +2,10 @@
 Test the dynamic issue registry system.
 """
 
+from pathlib import Path
+
 import pytest
+from rdflib import Graph
 from graph_hopper.graph_checks import ISSUE_REGISTRY
 
 
@@ -60,5 +63,30 @@ def test_registry_extensibility():
     assert len(cli_choices) == current_count + 1  # +1 for 'all'
 
 
+def test_issues_by_category():
+    """Test that category lookups return every issue type in that category."""
+    
+    bbmd_types = ISSUE_REGISTRY.get_issues_by_category('bbmd-configuration')
+    assert bbmd_types == ['duplicate-bbmd-warning', 'duplicate-bbmd-error', 'missing-bbmd-coverage']
+    
+    # Unknown categories resolve to an empty list
+    assert ISSUE_REGISTRY.get_issues_by_category('no-such-category') == []
+
+
+def test_iter_execute_checks_matches_execute_checks():
+    """Test that streamed results cover the same issue types as a full run."""
+    graph = Graph()
+    graph.parse(Path(__file__).parent / 'data' / 'duplicate_networks.ttl', format='turtle')
+    issues_to_check = ISSUE_REGISTRY.resolve_issues_to_check('duplicate-network')
+    
+    streamed = {}
+    for issues_by_type, _, _ in ISSUE_REGISTRY.iter_execute_checks(issues_to_check, graph):
+        streamed.update(issues_by_type)
+    all_issues, _, _ = ISSUE_REGISTRY.execute_checks(issues_to_check, graph)
+    
+    assert set(streamed) == {'duplicate-network', 'duplicate-router'}
+    assert streamed == all_issues
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -26,6 +26,9 @@ class TestRoutingInefficiencies:
         loop_issues = [i for i in issues if i['issue_type'] == 'routing-loop']
         assert len(loop_issues) >= 1
         
+        # Each back-and-forth link between two networks is not itself a loop
+        assert all(i['loop_length'] >= 3 for i in loop_issues)
+        
         # Find the main loop
         main_loop = next((i for i in loop_issues if i['loop_length'] == 3), None)
         assert main_loop is not None
@@ -36,6 +39,9 @@ class TestRoutingInefficiencies:
         loop_networks = set(main_loop['details']['loop_networks'])
         # Should contain 3 networks in the loop
         assert len(loop_networks) == 3
+        
+        # All three routers form the loop, whichever way round it was traced
+        assert len(main_loop['details']['loop_routers']) == 3
     
     def test_suboptimal_routing_paths(self):
         """Test detection of suboptimal routing paths."""
@@ -185,6 +191,33 @@ class TestRoutingInefficiencies:
         assert 'review' in warning_rec.lower()
         assert 'optimize' in warning_rec.lower()
 
+    
+    def test_long_network_chain_does_not_recurse(self):
+        """Test that loop and redundancy analysis handle chains deeper than the recursion limit."""
+        import sys
+        from collections import defaultdict
+        from graph_hopper.graph_checks.routing_inefficiencies import _check_routing_loops, _check_missing_redundancy
+        
+        chain_length = sys.getrecursionlimit() + 500
+        networks = [f'http://example.com/network/{i}' for i in range(chain_length)]
+        network_connections = defaultdict(set)
+        for a, b in zip(networks, networks[1:]):
+            network_connections[a].add(b)
+            network_connections[b].add(a)
+        routing_graph = {
+            'routers': {},
+            'router_serves': {},
+            'network_connections': network_connections,
+            'all_networks': set(networks)
+        }
+        
+        # Every interior network of a chain is an articulation point
+        redundancy_issues = _check_missing_redundancy(routing_graph, verbose=False)
+        assert len(redundancy_issues) == chain_length - 2
+        
+        # A chain has no loops
+        assert _check_routing_loops(routing_graph, verbose=False) == []
+
 
 class TestRoutingHelpers:
     """Test helper functions for routing analysis."""
@@ -212,3 +212,31 @@ def test_invalid_ip_addresses_ttl():
     # Device 100 is correct, devices 200 and 300 should be skipped due to invalid/non-IP addresses
     assert len(issues) == 0
     assert len(affected_nodes) == 0
+
+
+def test_multi_valued_device_properties_use_last_value_ttl():
+    """Test that a device with several addresses and labels is checked with the last of each."""
+    ttl_data = """
+    @prefix ns1: <http://data.ashrae.org/bacnet/2020#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    
+    <bacnet://subnet/10.0.0.0/8> a ns1:Subnet ;
+        rdfs:label "Plant Subnet" ;
+        ns1:subnet-address "10.0.0.0/8" .
+    
+    # Only the second address is outside the subnet
+    <bacnet://device/100> a ns1:Device ;
+        rdfs:label "Old Name", "New Name" ;
+        ns1:device-instance 100 ;
+        ns1:device-on-subnet <bacnet://subnet/10.0.0.0/8> ;
+        ns1:address "10.0.0.5", "192.168.1.200" .
+    """
+    
+    graph = Graph()
+    graph.parse(data=ttl_data, format='turtle')
+    
+    issues, affected_triples, affected_nodes = check_subnet_mismatches(graph)
+    
+    assert len(issues) == 1
+    assert issues[0]['device_address'] == "192.168.1.200"
+    assert issues[0]['device_label'] == "New Name"